@@ -13,15 +13,19 @@ Performance: ~17M hashes/sec on M4 (6 chars alnum ~1hr, 8+ use GPU)
 import argparse
 import hashlib
 import json
+import math
+import mmap
 import multiprocessing
 import os
-import re
 import socket
 import sys
+import threading
 import time
 import urllib.request
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from itertools import product
+from binascii import hexlify
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from functools import lru_cache
+from itertools import chain, product
 from typing import Generator, Optional
 
 # ============================================================================
@@ -65,6 +69,21 @@ LEET_MAP = {
     'l': ['l', '1'],
 }
 
+# Full l33t in one str.translate pass (first substitute for each letter)
+LEET_TRANS = str.maketrans({char: subs[1] for char, subs in LEET_MAP.items() if len(subs) > 1})
+
+# Seconds between progress line redraws
+PROGRESS_INTERVAL = 0.5
+
+# Batch sizing. The workload is compute-bound: each candidate is two one-block
+# SHA-256 calls on ~24 bytes of input, and a batch of 10k candidates is a few
+# hundred KB at most, so cache tiling buys nothing measurable from Python.
+# What batch size does trade off is per-task IPC and pickling overhead (too
+# small) against load balance and time-to-stop after a hit (too large); the
+# 10k-50k candidate defaults keep a task in the 10-50 ms range per core.
+# Only MAX_PENDING_PER_WORKER tasks per worker are queued at once.
+MAX_PENDING_PER_WORKER = 4
+
 
 # ============================================================================
 # CORE HASH FUNCTIONS
@@ -79,68 +98,193 @@ def compute_auth(password: str, dna: str) -> str:
 
 def compute_auth_fast(password: str, dna_bytes: bytes) -> str:
     """Optimized auth computation with pre-encoded DNA."""
-    webpass = hashlib.sha256(password.encode()).hexdigest()[:8]
-    auth_input = webpass.encode() + dna_bytes
-    return hashlib.sha256(auth_input).hexdigest()[:8]
+    # The firmware hashes hex(webpass) + DNA, so the constant DNA is a
+    # suffix and no midstate can be precomputed for the second hash.
+    webpass = hexlify(hashlib.sha256(password.encode()).digest()[:4])
+    return hashlib.sha256(webpass + dna_bytes).digest()[:4].hex()
+
+
+def encode_all(words: list[str]) -> list[bytes]:
+    """UTF-8 encode newline-free strings with one encode call for the whole list."""
+    return '\n'.join(words).encode().split(b'\n') if words else []
+
 
+def check_password_batch(args: tuple[list[bytes], bytes, bytes]) -> Optional[str]:
+    """Check a batch of UTF-8 encoded passwords. Returns password if found, None otherwise.
 
-def check_password_batch(args: tuple[list, str, bytes]) -> Optional[str]:
-    """Check a batch of passwords. Returns password if found, None otherwise."""
+    target is the 4-byte auth digest (bytes.fromhex of the 8-char hex target),
+    so candidates are compared without hex-encoding the second hash.
+    """
     passwords, target, dna_bytes = args
+    # Inlined compute_auth_fast: avoids a Python call frame per candidate.
+    sha256 = hashlib.sha256
     for password in passwords:
-        if compute_auth_fast(password, dna_bytes) == target:
-            return password
+        webpass = hexlify(sha256(password).digest()[:4])
+        if sha256(webpass + dna_bytes).digest()[:4] == target:
+            return password.decode()
     return None
 
 
-# ============================================================================
-# RULE-BASED MUTATIONS
-# ============================================================================
+@lru_cache(maxsize=8)
+def expand_tails(tail_spec: tuple) -> list[tuple[int, list[bytes]]]:
+    """Expand a tail spec (tuple of per-position charset tuples) into encoded tails.
 
-def apply_rules(word: str) -> Generator[str, None, None]:
-    """Apply mutation rules to a word."""
+    Returns (length, tails) groups in spec order. Cached so each worker
+    process builds the tail list once per attack instead of once per batch.
+    """
+    return [
+        (len(charsets), [''.join(combo).encode() for combo in product(*charsets)])
+        for charsets in tail_spec
+    ]
+
+
+def check_prefix_batch(args: tuple[tuple[list[bytes], tuple, Optional[int]], bytes, bytes]) -> Optional[str]:
+    """Check encoded prefix + tail combinations. Returns password if found, None otherwise.
+
+    Each prefix is absorbed into a SHA-256 state once; candidates copy that
+    midstate and only hash their tail. With max_len set, tails that would
+    push a candidate past max_len characters are skipped (groups must grow
+    in length); tails are single-byte, prefixes may not be.
+    """
+    (prefixes, tail_spec, max_len), target, dna_bytes = args
+    sha256 = hashlib.sha256
+    groups = expand_tails(tail_spec)
+    for prefix in prefixes:
+        base = sha256(prefix)
+        room = max_len - (len(prefix) if prefix.isascii() else len(prefix.decode())) if max_len else None
+        for length, tails in groups:
+            if length and room is not None and length > room:
+                break
+            for tail in tails:
+                h = base.copy()
+                h.update(tail)
+                webpass = hexlify(h.digest()[:4])
+                if sha256(webpass + dna_bytes).digest()[:4] == target:
+                    return (prefix + tail).decode()
+    return None
+
+
+def check_rules_batch(args: tuple[list[str], bytes, bytes]) -> Optional[str]:
+    """Check every rule variant of a batch of words. Returns password if found, None otherwise.
+
+    Checks the same candidates as apply_rules. Suffix variants are hashed from
+    a SHA-256 state of their base word, so each base is absorbed once rather
+    than once per suffix. Only the whole-word variants need a dedup set:
+    distinct suffixes on one base never collide, the empty suffix is always a
+    repeat of the lowercase or capitalized word, and the second base is
+    skipped when it equals the first.
+    """
+    words, target, dna_bytes = args
+    sha256 = hashlib.sha256
+    suffixes = [(len(suffix), suffix.encode()) for suffix in COMMON_SUFFIXES if suffix]
     seen = set()
+    for word in words:
+        seen.clear()
+        for candidate in rule_heads(word):
+            if 0 < len(candidate) <= 16 and candidate not in seen:
+                seen.add(candidate)
+                webpass = hexlify(sha256(candidate.encode()).digest()[:4])
+                if sha256(webpass + dna_bytes).digest()[:4] == target:
+                    return candidate
+        for base in rule_bases(word):
+            room = 16 - len(base)
+            state = sha256(base.encode())
+            for length, suffix in suffixes:
+                if length > room:
+                    continue
+                h = state.copy()
+                h.update(suffix)
+                webpass = hexlify(h.digest()[:4])
+                if sha256(webpass + dna_bytes).digest()[:4] == target:
+                    return base + suffix.decode()
+    return None
 
-    def emit(w):
-        if w not in seen and len(w) <= 16:
-            seen.add(w)
-            return w
-        return None
 
-    # Original
-    if p := emit(word):
-        yield p
+def decode_prefix(head: tuple, index: int) -> str:
+    """Map a keyspace index to its prefix, in itertools.product order."""
+    chars = []
+    for charset in reversed(head):
+        index, pos = divmod(index, len(charset))
+        chars.append(charset[pos])
+    return ''.join(reversed(chars))
+
+
+def check_keyspace_slice(args: tuple[tuple[tuple, int, int, tuple], bytes, bytes]) -> Optional[str]:
+    """Check head indices [start, start + count) against every tail. Returns password if found."""
+    (head, start, count, tail_spec), target, dna_bytes = args
+    prefixes = encode_all([decode_prefix(head, index) for index in range(start, start + count)])
+    return check_prefix_batch(((prefixes, tail_spec, None), target, dna_bytes))
+
+
+def read_words(path: str, start: int, end: int) -> list[bytes]:
+    """Read the non-empty, stripped lines in byte range [start, end) of a wordlist.
+
+    Words stay UTF-8 bytes; the range is decoded and re-encoded once only to
+    drop invalid sequences, instead of encoding every candidate later.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    data = data.decode('utf-8', errors='ignore').encode()
+    return [word for word in map(bytes.strip, data.split(b'\n')) if word]
+
+
+def check_wordlist_slice(args: tuple[tuple[str, int, int, bool], bytes, bytes]) -> Optional[str]:
+    """Check the words in one wordlist byte range, optionally with rules. Returns password if found."""
+    (path, start, end, use_rules), target, dna_bytes = args
+    words = read_words(path, start, end)
+    if use_rules:
+        return check_rules_batch(([word.decode() for word in words], target, dna_bytes))
+    return check_password_batch((words, target, dna_bytes))
+
 
-    # Case variations
-    for w in [word.lower(), word.upper(), word.capitalize(), word.swapcase()]:
-        if p := emit(w):
-            yield p
+def check_hybrid_slice(args: tuple[tuple[str, int, int, tuple, Optional[int]], bytes, bytes]) -> Optional[str]:
+    """Check the words in one wordlist byte range against every suffix. Returns password if found."""
+    (path, start, end, tail_spec, max_len), target, dna_bytes = args
+    words = read_words(path, start, end)
+    return check_prefix_batch(((words, tail_spec, max_len), target, dna_bytes))
+
+
+# ============================================================================
+# RULE-BASED MUTATIONS
+# ============================================================================
+
+def rule_heads(word: str) -> list[str]:
+    """Whole-word rule outputs (case and l33t variations), before dedup and length filtering."""
+    lower = word.lower()
+
+    # Original and case variations
+    variants = [word, lower, word.upper(), word.capitalize(), word.swapcase()]
 
     # L33t variations
-    leet = word.lower()
     for char, subs in LEET_MAP.items():
-        if char in leet and len(subs) > 1:
-            if p := emit(leet.replace(char, subs[1])):
-                yield p
+        if char in lower and len(subs) > 1:
+            variants.append(lower.replace(char, subs[1]))
 
     # Full l33t
-    full_leet = word.lower()
-    for char, subs in LEET_MAP.items():
-        if len(subs) > 1:
-            full_leet = full_leet.replace(char, subs[1])
-    if p := emit(full_leet):
-        yield p
+    variants.append(lower.translate(LEET_TRANS))
+    return variants
 
-    # Suffixes on common bases
-    for base in [word.lower(), word.capitalize()]:
-        for suffix in COMMON_SUFFIXES:
-            if p := emit(base + suffix):
-                yield p
+
+def rule_bases(word: str) -> tuple[str, ...]:
+    """Distinct bases that COMMON_SUFFIXES are appended to: the lowercase and capitalized word."""
+    lower = word.lower()
+    capitalized = word.capitalize()
+    return (lower,) if capitalized == lower else (lower, capitalized)
+
+
+def apply_rules(word: str) -> Generator[str, None, None]:
+    """Apply mutation rules to a word."""
+    variants = rule_heads(word) + [base + suffix for base in rule_bases(word) for suffix in COMMON_SUFFIXES]
+    yield from dict.fromkeys(w for w in variants if 0 < len(w) <= 16)
 
 
 # ============================================================================
 # PATTERN GENERATORS
 # ============================================================================
+# The crack_* modes enumerate their keyspaces inside the workers (see
+# keyspace_tasks and check_prefix_batch); these generators spell out the same
+# candidate order one string at a time and serve as the reference for tests.
 
 def generate_mask_candidates(mask: str) -> Generator[str, None, None]:
     """Generate candidates from mask pattern.
@@ -154,6 +298,12 @@ def generate_mask_candidates(mask: str) -> Generator[str, None, None]:
         ?w = alphanumeric
         literal = literal character
     """
+    for combo in product(*parse_mask(mask)):
+        yield ''.join(combo)
+
+
+def parse_mask(mask: str) -> list[str]:
+    """Split a mask pattern into one charset per position (literals become 1-char sets)."""
     charsets = []
     i = 0
     while i < len(mask):
@@ -165,9 +315,7 @@ def generate_mask_candidates(mask: str) -> Generator[str, None, None]:
                 continue
         charsets.append(mask[i])
         i += 1
-
-    for combo in product(*charsets):
-        yield ''.join(combo)
+    return charsets
 
 
 def generate_hybrid(words: list[str], suffix_len: int) -> Generator[str, None, None]:
@@ -223,32 +371,38 @@ def fetch_device_info(ip: str) -> tuple[str, str]:
         auth_url = f'http://{ip}/get_auth.cgi'
         response = urllib.request.urlopen(auth_url, timeout=5)
         auth_resp = response.read().decode()
-        auth_match = re.search(r'"auth":"([^"]+)"', auth_resp)
-        if not auth_match:
+        auth, end, _ = auth_resp.partition('"auth":"')[2].partition('"')
+        if not (auth and end):
             raise ValueError("Could not parse auth from get_auth.cgi")
-        auth = auth_match.group(1)
     except Exception as e:
         raise ValueError(f"Failed to fetch auth from {ip}: {e}") from e
 
     try:
         sock = socket.socket()
         sock.settimeout(5)
+        # The request is a few dozen bytes; send it without waiting on Nagle.
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         sock.connect((ip, 4028))
         sock.send(json.dumps({'command': 'stats'}).encode())
 
-        data = b''
+        # Receive straight into one growing buffer instead of concatenating
+        # a new bytes object per chunk.
+        buf = bytearray(65536)
+        size = 0
         while True:
-            chunk = sock.recv(4096)
-            if not chunk:
+            if size == len(buf):
+                buf.extend(bytes(len(buf)))
+            with memoryview(buf) as view:
+                n = sock.recv_into(view[size:])
+            if not n:
                 break
-            data += chunk
+            size += n
         sock.close()
 
-        stats_resp = data.decode().rstrip('\x00')
-        dna_match = re.search(r'DNA\[([^\]]+)\]', stats_resp)
-        if not dna_match:
+        stats_resp = buf[:size].decode().rstrip('\x00')
+        dna, end, _ = stats_resp.partition('DNA[')[2].partition(']')
+        if not (dna and end):
             raise ValueError("Could not parse DNA from stats")
-        dna = dna_match.group(1)
     except Exception as e:
         raise ValueError(f"Failed to fetch DNA from {ip}:4028: {e}") from e
 
@@ -270,20 +424,38 @@ def format_time_estimate(seconds: float) -> str:
     return f"{seconds / 86400:.1f} days"
 
 
-def crack_generator(
+def print_progress(checked: int, total: int, elapsed: float) -> None:
+    """Redraw the in-place progress line."""
+    rate = checked / elapsed if elapsed > 0 else 0
+    if total > 0:
+        pct = (checked / total) * 100
+        eta = (total - checked) / rate if rate > 0 else 0
+        print(f"\r[*] {pct:.2f}% | {checked:,}/{total:,} | {rate:,.0f}/s | ETA: {eta:.0f}s", end='', flush=True)
+    else:
+        print(f"\r[*] Checked: {checked:,} | {rate:,.0f}/s | {elapsed:.1f}s", end='', flush=True)
+
+
+def crack_tasks(
     target: str,
     dna: str,
-    generator: Generator[str, None, None],
+    worker,
+    tasks,
     total: int = 0,
     desc: str = "Recovering",
     num_workers: Optional[int] = None,
-    batch_size: int = 10000,
 ) -> Optional[str]:
-    """Generic cracking engine using a password generator."""
+    """Run (payload, count) tasks through worker processes until one finds the password.
+
+    Each worker is called with (payload, target_bytes, dna_bytes) and returns
+    the password or None; count is the number of candidates in the payload.
+    Progress is counted as tasks complete and drawn by a separate thread every
+    PROGRESS_INTERVAL seconds, keeping terminal I/O out of the submit loop.
+    """
     if num_workers is None:
         num_workers = multiprocessing.cpu_count()
 
     dna_bytes = dna.encode()
+    target_bytes = bytes.fromhex(target)
 
     print(f"[*] {desc}")
     print(f"[*] Target: {target}")
@@ -296,63 +468,70 @@ def crack_generator(
         print(f"[*] Estimated time: {format_time_estimate(eta_secs)}")
     print()
 
-    start_time = time.time()
+    start_time = time.monotonic()
     checked = 0
     found = None
+    stop = threading.Event()
+
+    checked_lock = threading.Lock()
+
+    def add_checked(future, count: int) -> None:
+        # Done callbacks run on the executor's management thread, or inline in
+        # the submitting thread for a future that is already done, so the
+        # counter is shared. Cancelled tasks were never run and don't count.
+        nonlocal checked
+        if future.cancelled():
+            return
+        with checked_lock:
+            checked += count
+
+    def report() -> None:
+        while not stop.wait(PROGRESS_INTERVAL):
+            print_progress(checked, total, time.monotonic() - start_time)
+
+    reporter = threading.Thread(target=report, daemon=True)
+    reporter.start()
 
     with ProcessPoolExecutor(max_workers=num_workers) as executor:
-        futures = []
-        batch = []
+        pending = set()
 
         try:
-            for password in generator:
-                batch.append(password)
-
-                if len(batch) >= batch_size:
-                    futures.append(executor.submit(check_password_batch, (batch.copy(), target, dna_bytes)))
-                    batch.clear()
-
-                    # Check completed futures
-                    done_futures = [f for f in futures if f.done()]
-                    for future in done_futures:
-                        result = future.result()
-                        if result:
-                            found = result
-                            break
-                        futures.remove(future)
-
+            for payload, count in tasks:
+                # Keep a bounded window of tasks in flight so the parent's
+                # memory stays flat and a hit is noticed within one window.
+                if len(pending) >= num_workers * MAX_PENDING_PER_WORKER:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    found = next(filter(None, (future.result() for future in done)), None)
                     if found:
                         break
 
-                    # Progress update
-                    checked += batch_size
-                    elapsed = time.time() - start_time
-                    rate = checked / elapsed if elapsed > 0 else 0
-                    if total > 0:
-                        pct = (checked / total) * 100
-                        eta = (total - checked) / rate if rate > 0 else 0
-                        print(f"\r[*] {pct:.2f}% | {checked:,}/{total:,} | {rate:,.0f}/s | ETA: {eta:.0f}s", end='')
-                    else:
-                        print(f"\r[*] Checked: {checked:,} | {rate:,.0f}/s | {elapsed:.1f}s", end='')
-
-            # Submit remaining batch
-            if batch and not found:
-                futures.append(executor.submit(check_password_batch, (batch.copy(), target, dna_bytes)))
+                future = executor.submit(worker, (payload, target_bytes, dna_bytes))
+                future.add_done_callback(lambda f, count=count: add_checked(f, count))
+                pending.add(future)
 
             # Wait for remaining futures
             if not found:
-                for future in as_completed(futures):
+                for future in as_completed(pending):
                     result = future.result()
                     if result:
                         found = result
                         break
 
+            for future in pending:
+                future.cancel()
+
         except KeyboardInterrupt:
+            stop.set()
             print("\n[!] Interrupted")
             executor.shutdown(wait=False)
             return None
 
-    elapsed = time.time() - start_time
+        finally:
+            stop.set()
+            reporter.join()
+
+    elapsed = time.monotonic() - start_time
+    print_progress(checked, total, elapsed)
     print()
 
     if found:
@@ -366,6 +545,63 @@ def crack_generator(
         return None
 
 
+def split_charsets(charsets: list[str], batch_size: int) -> tuple[list[str], list[str], int]:
+    """Split positions into (head, tail, tail_count) so the tail keyspace covers a batch.
+
+    Heads are enumerated by the parent as prefixes; tails are enumerated by
+    the worker against each prefix's SHA-256 midstate.
+    """
+    split = len(charsets)
+    tail_count = 1
+    while split > 0 and tail_count < batch_size:
+        split -= 1
+        tail_count *= len(charsets[split])
+    return charsets[:split], charsets[split:], tail_count
+
+
+def keyspace_tasks(charsets: list[str], batch_size: int):
+    """Yield check_keyspace_slice tasks covering every combination of charsets.
+
+    Tasks carry only an index range over the head positions, so the payload
+    sent to a worker is a few small tuples regardless of batch size.
+    """
+    head, tail, tail_count = split_charsets(charsets, batch_size)
+    head = tuple(head)
+    tail_spec = (tuple(tail),)
+    head_count = math.prod(len(charset) for charset in head)
+    per_task = max(1, batch_size // tail_count)
+    for start in range(0, head_count, per_task):
+        count = min(per_task, head_count - start)
+        yield (head, start, count, tail_spec), count * tail_count
+
+
+def wordlist_ranges(path: str, lines_per_range: int):
+    """Split a wordlist into newline-aligned byte ranges of about lines_per_range lines.
+
+    Returns (line_count, ranges) where ranges yields (start, end, lines). The
+    file is scanned through mmap, so it is never loaded into the parent.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0, iter(())
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    chunk = 1 << 20
+    line_count = sum(mm[i:i + chunk].count(b'\n') for i in range(0, size, chunk)) + (mm[-1:] != b'\n')
+    span = max(1, size * lines_per_range // line_count)
+
+    def ranges():
+        with mm:
+            start = 0
+            while start < size:
+                end = mm.find(b'\n', min(start + span, size) - 1)
+                end = size if end < 0 else end + 1
+                yield start, end, max(1, mm[start:end].count(b'\n'))
+                start = end
+
+    return line_count, ranges()
+
+
 def crack_wordlist(
     target: str,
     dna: str,
@@ -375,26 +611,17 @@ def crack_wordlist(
     batch_size: int = 10000,
 ) -> Optional[str]:
     """Dictionary attack using wordlist file."""
-
-    def word_generator():
-        with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                password = line.strip()
-                if not password:
-                    continue
-                if use_rules:
-                    yield from apply_rules(password)
-                else:
-                    yield password
-
     print("[*] Counting wordlist...")
-    with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as f:
-        line_count = sum(1 for _ in f)
+    multiplier = 30 if use_rules else 1
+    line_count, ranges = wordlist_ranges(wordlist_path, max(1, batch_size // multiplier))
 
-    total = line_count * (30 if use_rules else 1)
+    total = line_count * multiplier
     desc = f"Dictionary: {wordlist_path}" + (" +rules" if use_rules else "")
 
-    return crack_generator(target, dna, word_generator(), total, desc, num_workers, batch_size)
+    # Workers read their own byte range of the file, so only offsets cross
+    # the process boundary and the wordlist is never held in the parent.
+    tasks = (((wordlist_path, start, end, use_rules), lines * multiplier) for start, end, lines in ranges)
+    return crack_tasks(target, dna, check_wordlist_slice, tasks, total, desc, num_workers)
 
 
 def crack_mask(
@@ -406,9 +633,8 @@ def crack_mask(
 ) -> Optional[str]:
     """Mask attack with pattern."""
     total = count_mask_combinations(mask)
-    return crack_generator(
-        target, dna, generate_mask_candidates(mask), total, f"Mask: {mask}", num_workers, batch_size
-    )
+    tasks = keyspace_tasks(parse_mask(mask), batch_size)
+    return crack_tasks(target, dna, check_keyspace_slice, tasks, total, f"Mask: {mask}", num_workers)
 
 
 def crack_hybrid(
@@ -420,25 +646,27 @@ def crack_hybrid(
     batch_size: int = 10000,
 ) -> Optional[str]:
     """Hybrid attack: wordlist + brute force suffix."""
-    words = []
-    with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            word = line.strip()
-            if word:
-                words.append(word)
-
     suffix_chars = len(CHARSET_DIGITS + CHARSET_SPECIAL_COMMON)
     suffix_combos = sum(suffix_chars**length for length in range(suffix_len + 1))
-    total = len(words) * suffix_combos
-
-    return crack_generator(
+    line_count, ranges = wordlist_ranges(wordlist_path, max(1, batch_size // suffix_combos))
+    total = line_count * suffix_combos
+
+    # Each word is a fixed prefix; its suffixes (shortest first, including
+    # the bare word) are hashed from the word's SHA-256 midstate. Workers
+    # read their words straight from the file by byte range.
+    suffix_set = CHARSET_DIGITS + CHARSET_SPECIAL_COMMON
+    tail_spec = tuple((suffix_set,) * length for length in range(suffix_len + 1))
+    tasks = (
+        ((wordlist_path, start, end, tail_spec, 16), lines * suffix_combos) for start, end, lines in ranges
+    )
+    return crack_tasks(
         target,
         dna,
-        generate_hybrid(words, suffix_len),
+        check_hybrid_slice,
+        tasks,
         total,
         f"Hybrid: {wordlist_path} + {suffix_len}-char suffix",
         num_workers,
-        batch_size,
     )
 
 
@@ -453,14 +681,19 @@ def crack_bruteforce(
 ) -> Optional[str]:
     """Brute force attack."""
     total = count_combinations(charset, max_len, min_len)
-    return crack_generator(
+    # Workers enumerate their slice of the keyspace themselves, so only index
+    # ranges cross the process boundary instead of candidate strings.
+    tasks = chain.from_iterable(
+        keyspace_tasks([charset] * length, batch_size) for length in range(min_len, max_len + 1)
+    )
+    return crack_tasks(
         target,
         dna,
-        generate_bruteforce(charset, max_len, min_len),
+        check_keyspace_slice,
+        tasks,
         total,
         f"Brute force: {min_len}-{max_len} chars, {len(charset)} char set",
         num_workers,
-        batch_size,
     )
 
 
@@ -6,4 +6,5 @@ python3 -m unittest \
   tests.test_cli_params \
   tests.test_parse_properties \
   tests.test_q_support \
+  tests.test_password \
   tests.test_devices
@@ -1,10 +1,19 @@
 """Unit tests for CLI argument handling and output formatting."""
 
+import errno
 import io
+import json
+import re
+import socket
+import socketserver
 import sys
 import tempfile
+import threading
+import time
 import unittest
+from concurrent.futures import Future
 from contextlib import redirect_stderr, redirect_stdout
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import thermal
@@ -96,7 +105,19 @@ class FakeMiner:
     def ascset(self, param):
         return {"STATUS": [{"STATUS": "S", "Msg": "ASC 0 set OK"}]}
 
-    def parse_stats(self, device_key=None, version_entry=None):
+    @classmethod
+    def fleet_cmd(cls, hosts, port=4028, command="version", param=None, timeout=10, limit=10, on_reply=None):
+        results = {}
+        for host in hosts:
+            results[host] = cls(host, port).cmd(command, param)
+            if on_reply:
+                on_reply(host, results[host])
+        return results
+
+    def cmd_multi(self, *commands):
+        return [self.cmd(command) for command in commands]
+
+    def parse_stats(self, device_key=None, version_entry=None, stats=None):
         return thermal.parse_mm_id0(_make_mm())
 
 
@@ -146,14 +167,348 @@ class CliUnitTests(unittest.TestCase):
         self.assertIn("OFFLINE", output)
         self.assertIn("192.168.0.10", output)
 
+    def test_status_rows_print_as_replies_arrive(self):
+        out = io.StringIO()
+        printed_early = []
+
+        class StreamingMiner(FakeMiner):
+            @classmethod
+            def fleet_cmd(cls, hosts, port=4028, command="version", param=None, timeout=10, limit=10,
+                          on_reply=None):
+                on_reply(hosts[0], cls(hosts[0], port).cmd(command, param))
+                deadline = time.monotonic() + 2
+                while hosts[0] not in out.getvalue() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                printed_early.append(hosts[0] in out.getvalue())
+                on_reply(hosts[1], None)
+                return {}
+
+        with patch.object(sys, "argv", ["thermal.py", "-H", "192.168.0.10,192.168.0.11", "status"]), \
+            patch("thermal.Miner", StreamingMiner), \
+            redirect_stdout(out):
+            thermal.main()
+        self.assertEqual(printed_early, [True])
+        self.assertIn("192.168.0.11", out.getvalue())
+
+    def test_status_sweep_error_is_reported_per_host(self):
+        class FailingMiner(FakeMiner):
+            @classmethod
+            def fleet_cmd(cls, hosts, *args, on_reply=None, **kwargs):
+                on_reply(hosts[0], None)
+                raise OSError(24, "Too many open files")
+
+        out = io.StringIO()
+        with patch.object(sys, "argv", ["thermal.py", "-H", "192.168.0.10,192.168.0.11", "status"]), \
+            patch("thermal.Miner", FailingMiner), \
+            redirect_stdout(out):
+            thermal.main()
+        self.assertRegex(out.getvalue(), r"192\.168\.0\.10 +OFFLINE")
+        self.assertIn("192.168.0.11     ERROR: [Errno 24] Too many open files", out.getvalue())
+
+    def test_fleet_output_stays_with_its_host(self):
+        class EchoMiner(FakeMiner):
+            def cmd(self, command, param=None):
+                time.sleep(0.005)  # let the workers overlap
+                return {"STATUS": [{"STATUS": "S"}], "HOST": self.host}
+
+        hosts = [f"10.0.0.{i}" for i in range(24)]
+        out = io.StringIO()
+        with patch.object(sys, "argv", ["thermal.py", "-H", ",".join(hosts), "-j", "8", "raw", "version"]), \
+            patch("thermal.Miner", EchoMiner), \
+            redirect_stdout(out):
+            thermal.main()
+        # Blocks start with a "[host]" line; the JSON bodies hold the host too.
+        parts = re.split(r"^\[(.+)\]$", out.getvalue(), flags=re.M)[1:]
+        self.assertEqual(parts[::2], hosts)
+        for host, body in zip(hosts, parts[1::2]):
+            self.assertEqual(re.findall(r"10\.0\.0\.\d+", body), [host])
+
+    def test_print_in_order_handles_failures(self):
+        futures = {}
+        for index, value in enumerate(["a", None, "c"]):
+            future = Future()
+            if value is None:
+                future.set_exception(RuntimeError("boom"))
+            else:
+                future.set_result(value)
+            futures[future] = index
+        out = io.StringIO()
+        thermal._print_in_order(futures, lambda i, e: f"{i}: {e}", file=out)
+        self.assertEqual(out.getvalue().split(), ["a", "1:", "boom", "c"])
+
     def test_fan_validation(self):
-        class Args:
-            speed = "10"
+        args = SimpleNamespace(speed="10")
         err = io.StringIO()
         with redirect_stderr(err):
-            thermal.do_fan(FakeMiner("192.168.0.10"), Args)
+            thermal.do_fan(FakeMiner("192.168.0.10"), args)
         self.assertIn("fan speed must be 15-100", err.getvalue())
 
 
+class MultiCommandMiner(thermal.Miner):
+    """Miner whose transport answers joined report commands like CGMiner."""
+
+    def __init__(self, supports_multi=True, online=True):
+        super().__init__("192.168.0.10", 4028, timeout=5)
+        self.supports_multi = supports_multi
+        self.online = online
+        self.sent = []
+
+    def cmd(self, command, param=None):
+        self.sent.append(command)
+        if not self.online:
+            return None
+        replies = {
+            "version": {"STATUS": [{"STATUS": "S"}], "VERSION": [{"PROD": "Avalon Mini3"}]},
+            "stats": {"STATUS": [{"STATUS": "S"}], "STATS": [{"MM ID0": _make_mm()}]},
+        }
+        if "+" in command:
+            if not self.supports_multi:
+                return {"STATUS": [{"STATUS": "E", "Msg": "Invalid command"}]}
+            return {name: [replies[name]] for name in command.split("+")}
+        return replies[command]
+
+
+class CmdMultiTests(unittest.TestCase):
+    def test_single_round_trip(self):
+        miner = MultiCommandMiner()
+        ver, stats = miner.cmd_multi("version", "stats")
+        self.assertEqual(miner.sent, ["version+stats"])
+        self.assertEqual(ver["VERSION"][0]["PROD"], "Avalon Mini3")
+        self.assertIn("MM ID0", stats["STATS"][0])
+
+    def test_falls_back_to_separate_requests(self):
+        miner = MultiCommandMiner(supports_multi=False)
+        ver, stats = miner.cmd_multi("version", "stats")
+        self.assertEqual(miner.sent, ["version+stats", "version", "stats"])
+        self.assertIn("VERSION", ver)
+        self.assertIn("STATS", stats)
+
+    def test_offline_does_not_retry(self):
+        miner = MultiCommandMiner(online=False)
+        self.assertEqual(miner.cmd_multi("version", "stats"), [None, None])
+        self.assertEqual(miner.sent, ["version+stats"])
+
+
+class ReplyDecodingTests(unittest.TestCase):
+    def test_decodes_with_and_without_orjson(self):
+        data = b'{"STATS":[{"MM ID0":"Elapsed[5]"}],"X":1.5}'
+        expected = {"STATS": [{"MM ID0": "Elapsed[5]"}], "X": 1.5}
+        self.assertEqual(thermal._loads_reply(data), expected)
+        with patch.object(thermal, "orjson", None):
+            self.assertEqual(thermal._loads_reply(data), expected)
+
+    def test_values_orjson_rejects_fall_back_to_json(self):
+        reply = thermal._loads_reply(b'{"temp": NaN, "big": 123456789012345678901234567890}')
+        self.assertNotEqual(reply["temp"], reply["temp"])
+        self.assertEqual(reply["big"], 123456789012345678901234567890)
+
+
+class ResolveHostsTests(unittest.TestCase):
+    def test_literals_skip_lookup_and_failures_map_to_none(self):
+        def fake_getaddrinfo(host, port, *args):
+            if host == "miner-a":
+                return [(2, 1, 6, "", ("10.0.0.5", port))]
+            raise OSError("unknown host")
+
+        with patch.dict(thermal._ADDR_CACHE, clear=True), \
+                patch("thermal.socket.getaddrinfo", side_effect=fake_getaddrinfo) as lookup:
+            result = thermal.resolve_hosts(["10.0.0.1", "miner-a", "missing", "miner-a"], 4028)
+            self.assertEqual(thermal.resolve_hosts(["miner-a"], 4028), {"miner-a": ("10.0.0.5", 4028)})
+        self.assertEqual(
+            result,
+            {"10.0.0.1": ("10.0.0.1", 4028), "miner-a": ("10.0.0.5", 4028), "missing": None},
+        )
+        self.assertEqual(sorted(call.args[0] for call in lookup.call_args_list), ["miner-a", "missing"])
+
+
+def _closed_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class AddressCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.port = _closed_port()
+        self.key = ("moved-miner", self.port)
+        thermal._ADDR_CACHE[self.key] = ("127.0.0.1", self.port)
+        self.addCleanup(thermal._ADDR_CACHE.pop, self.key, None)
+
+    def test_failed_connect_drops_cached_address(self):
+        with redirect_stderr(io.StringIO()):
+            self.assertIsNone(thermal.Miner("moved-miner", self.port, timeout=2).cmd("version"))
+        self.assertNotIn(self.key, thermal._ADDR_CACHE)
+
+    def test_fleet_failed_connect_drops_cached_address(self):
+        self.assertEqual(thermal.Miner.fleet_cmd(["moved-miner"], self.port, timeout=2), {"moved-miner": None})
+        self.assertNotIn(self.key, thermal._ADDR_CACHE)
+
+
+class _CgminerHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        request = json.loads(self.request.recv(4096))
+        reply = {"STATUS": [{"STATUS": "S"}], "COMMAND": request["command"], "PARAM": request.get("parameter")}
+        self.request.sendall(json.dumps(reply).encode() + b"\x00")
+
+
+class _BulkRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        data = bytearray()
+        while not data.endswith(b"}"):
+            chunk = self.request.recv(1 << 16)
+            if not chunk:
+                return
+            data += chunk
+        reply = {"STATUS": [{"STATUS": "S"}], "LENGTH": len(json.loads(data)["parameter"])}
+        self.request.sendall(json.dumps(reply).encode() + b"\x00")
+
+
+class _SlowCgminerHandler(_CgminerHandler):
+    lock = threading.Lock()
+    active = peak = 0
+
+    def handle(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.05)
+        with cls.lock:
+            cls.active -= 1
+        super().handle()
+
+
+class _TrickleHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.request.recv(4096)
+        try:
+            for _ in range(40):
+                self.request.sendall(b" ")
+                time.sleep(0.05)
+        except OSError:
+            pass
+
+
+class CmdTimeoutTests(unittest.TestCase):
+    def test_timeout_includes_address_lookup(self):
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _CgminerHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        port = server.server_address[1]
+
+        def slow_address():
+            time.sleep(0.3)
+            return ("127.0.0.1", port)
+
+        miner = thermal.Miner("127.0.0.1", port, timeout=0.2)
+        with patch.object(miner, "_address", side_effect=slow_address), redirect_stderr(io.StringIO()):
+            self.assertIsNone(miner.cmd("version"))
+
+    def test_timeout_option_must_be_positive(self):
+        for value in ("0", "-1", "inf", "abc"):
+            err = io.StringIO()
+            with self.subTest(value=value), \
+                    patch.object(sys, "argv", ["thermal.py", "-H", "192.168.0.10", "-t", value, "status"]), \
+                    redirect_stderr(err), self.assertRaises(SystemExit) as cm:
+                thermal.main()
+            self.assertEqual(cm.exception.code, 2)
+            self.assertIn("-t/--timeout", err.getvalue())
+        self.assertEqual(thermal.positive_float("0.5"), 0.5)
+
+    def test_timeout_bounds_whole_request(self):
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _TrickleHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        miner = thermal.Miner("127.0.0.1", server.server_address[1], timeout=0.3)
+        start = time.monotonic()
+        with redirect_stderr(io.StringIO()):
+            self.assertIsNone(miner.cmd("version"))
+        self.assertLess(time.monotonic() - start, 1.0)
+
+
+class FleetCmdTests(unittest.TestCase):
+    def setUp(self):
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _CgminerHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.port = self.server.server_address[1]
+
+    def test_fetches_reply_per_host(self):
+        results = thermal.Miner.fleet_cmd(["127.0.0.1", "localhost"], self.port, "ascset", "0,help", timeout=5)
+        self.assertEqual(set(results), {"127.0.0.1", "localhost"})
+        for reply in results.values():
+            self.assertEqual((reply["COMMAND"], reply["PARAM"]), ("ascset", "0,help"))
+
+    def test_unreachable_host_maps_to_none(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.assertEqual(thermal.Miner.fleet_cmd(["127.0.0.1"], self.port, timeout=5), {"127.0.0.1": None})
+
+    def _local_fleet(self, count):
+        hosts = [f"miner-{i}" for i in range(count)]
+        addresses = {host: ("127.0.0.1", self.port) for host in hosts}
+        return hosts, patch("thermal.resolve_hosts", return_value=addresses)
+
+    def test_limit_caps_requests_in_flight(self):
+        self.server.RequestHandlerClass = _SlowCgminerHandler
+        hosts, resolved = self._local_fleet(6)
+        with resolved:
+            results = thermal.Miner.fleet_cmd(hosts, self.port, timeout=5, limit=2)
+        self.assertTrue(all(results[host] for host in hosts))
+        self.assertLessEqual(_SlowCgminerHandler.peak, 2)
+
+    def test_large_request_survives_short_writes(self):
+        self.server.RequestHandlerClass = _BulkRequestHandler
+        param = "x" * (16 << 20)  # larger than the socket send buffer
+        results = thermal.Miner.fleet_cmd(["127.0.0.1"], self.port, "ascset", param, timeout=5)
+        self.assertEqual(results["127.0.0.1"]["LENGTH"], len(param))
+
+    def test_on_reply_sees_every_host(self):
+        seen = []
+        hosts = ["127.0.0.1", "missing.invalid"]
+        with patch("thermal.resolve_hosts", return_value={hosts[0]: ("127.0.0.1", self.port), hosts[1]: None}):
+            results = thermal.Miner.fleet_cmd(hosts, self.port, timeout=5, on_reply=lambda *pair: seen.append(pair))
+        self.assertEqual(sorted(seen, key=lambda pair: pair[0]), sorted(results.items()))
+        self.assertEqual(len(seen), 2)
+
+    def test_out_of_sockets_waits_for_a_free_slot(self):
+        real_socket = socket.socket
+        calls = []
+
+        def flaky_socket(*args, **kwargs):
+            if threading.current_thread() is threading.main_thread():
+                calls.append(None)
+                if len(calls) == 2:
+                    raise OSError(errno.EMFILE, "Too many open files")
+            return real_socket(*args, **kwargs)
+
+        hosts, resolved = self._local_fleet(3)
+        with resolved, patch("thermal.socket.socket", side_effect=flaky_socket):
+            results = thermal.Miner.fleet_cmd(hosts, self.port, timeout=5, limit=3)
+        self.assertTrue(all(results[host] for host in hosts))
+
+    def test_out_of_sockets_with_nothing_in_flight_raises(self):
+        error = OSError(errno.EMFILE, "Too many open files")
+        hosts, resolved = self._local_fleet(2)
+        with resolved, patch("thermal.socket.socket", side_effect=error), self.assertRaises(OSError):
+            thermal.Miner.fleet_cmd(hosts, self.port, timeout=5)
+
+    def test_slow_lookup_is_bounded_by_timeout(self):
+        def slow_getaddrinfo(*args):
+            time.sleep(1)
+            raise OSError("lookup timed out")
+
+        start = time.monotonic()
+        with patch("thermal.socket.getaddrinfo", side_effect=slow_getaddrinfo):
+            self.assertEqual(thermal.Miner.fleet_cmd(["slow-miner"], self.port, timeout=0.2), {"slow-miner": None})
+        self.assertLess(time.monotonic() - start, 0.8)
+
+
 if __name__ == "__main__":
     unittest.main()
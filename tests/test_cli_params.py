@@ -3,10 +3,29 @@
 import io
 import unittest
 from contextlib import redirect_stdout, redirect_stderr
+from types import SimpleNamespace
 
 import thermal
 
 
+class _NullIO(io.TextIOBase):
+    """Text sink for tests that discard output."""
+
+    def write(self, s):
+        return len(s)
+
+
+_NULL = _NullIO()
+
+
+def _stderr_of(func, *args):
+    """Run func(*args) and return what it wrote to stderr."""
+    err = io.StringIO()
+    with redirect_stderr(err):
+        func(*args)
+    return err.getvalue()
+
+
 class RecordingMiner:
     def __init__(self, host="192.168.0.10", port=4028, timeout=10):
         self.host = host
@@ -37,7 +56,10 @@ class RecordingMiner:
         self.last_ascset = param
         return {"STATUS": [{"STATUS": "S", "Msg": "ASC 0 set OK"}]}
 
-    def parse_stats(self, device_key=None, version_entry=None):
+    def cmd_multi(self, *commands):
+        return [self.cmd(command) for command in commands]
+
+    def parse_stats(self, device_key=None, version_entry=None, stats=None):
         return {
             "hashrate": 40.0,
             "hashrate_max": 41.0,
@@ -60,164 +82,143 @@ class RecordingMiner:
 
 class CliParamTests(unittest.TestCase):
     def test_do_fan_auto(self):
-        miner = RecordingMiner()
-        class Args: speed = "auto"
-        thermal.do_fan(miner, Args)
-        self.assertEqual(miner.last_ascset, "0,fan-spd,-1")
+        for speed in ("auto", "-1"):
+            with self.subTest(speed=speed):
+                miner = RecordingMiner()
+                out = io.StringIO()
+                with redirect_stdout(out):
+                    thermal.do_fan(miner, SimpleNamespace(speed=speed))
+                self.assertEqual(miner.last_ascset, "0,fan-spd,-1")
+                self.assertEqual(out.getvalue(), "ok: fan set to auto\n")
 
     def test_do_fan_percent(self):
         miner = RecordingMiner()
-        class Args: speed = "80"
-        thermal.do_fan(miner, Args)
+        args = SimpleNamespace(speed="80")
+        thermal.do_fan(miner, args)
         self.assertEqual(miner.last_ascset, "0,fan-spd,80")
 
     def test_do_fan_invalid(self):
         miner = RecordingMiner()
-        class Args: speed = "10"
-        err = io.StringIO()
-        with redirect_stderr(err):
-            thermal.do_fan(miner, Args)
-        self.assertIn("fan speed must be 15-100", err.getvalue())
+        args = SimpleNamespace(speed="10")
+        self.assertIn("fan speed must be 15-100", _stderr_of(thermal.do_fan, miner, args))
         self.assertIsNone(miner.last_ascset)
 
     def test_do_freq(self):
         miner = RecordingMiner()
-        class Args: freq = 500
-        thermal.do_freq(miner, Args)
+        args = SimpleNamespace(freq=500)
+        thermal.do_freq(miner, args)
         self.assertEqual(miner.last_ascset, "0,frequency,500:500:500:500")
 
     def test_do_mode(self):
         miner = RecordingMiner()
-        class Args: mode = 2
-        thermal.do_mode(miner, Args)
+        args = SimpleNamespace(mode=2)
+        thermal.do_mode(miner, args)
         self.assertEqual(miner.last_ascset, "0,workmode,set,2")
 
     def test_do_level(self):
         miner = RecordingMiner()
-        class Args: level = 3
-        thermal.do_level(miner, Args)
+        args = SimpleNamespace(level=3)
+        thermal.do_level(miner, args)
         self.assertEqual(miner.last_ascset, "0,worklevel,set,3")
 
     def test_do_work_mode_level(self):
         miner = RecordingMiner()
-        class Args:
-            mode = 1
-            level = 2
-        thermal.do_work_mode_level(miner, Args)
+        args = SimpleNamespace(mode=1, level=2)
+        thermal.do_work_mode_level(miner, args)
         self.assertEqual(miner.last_ascset, "0,work_mode_lvl,set,1,2")
 
     def test_do_voltage(self):
         miner = RecordingMiner()
-        class Args:
-            mv = 2250
-        thermal.do_voltage(miner, Args)
+        args = SimpleNamespace(mv=2250)
+        thermal.do_voltage(miner, args)
         self.assertEqual(miner.last_ascset, "0,voltage,2250")
 
     def test_do_voltage_invalid(self):
         miner = RecordingMiner()
-        class Args:
-            mv = 3000
-        err = io.StringIO()
-        with redirect_stderr(err):
-            thermal.do_voltage(miner, Args)
-        self.assertIn("voltage must be in range 2150-2600", err.getvalue())
+        args = SimpleNamespace(mv=3000)
+        self.assertIn("voltage must be in range 2150-2600", _stderr_of(thermal.do_voltage, miner, args))
         self.assertIsNone(miner.last_ascset)
 
     def test_do_solo_allowed_on(self):
         miner = RecordingMiner()
-        class Args:
-            enabled = "on"
-        thermal.do_solo_allowed(miner, Args)
+        args = SimpleNamespace(enabled="on")
+        thermal.do_solo_allowed(miner, args)
         self.assertEqual(miner.last_ascset, "0,solo-allowed,1")
 
     def test_do_solo_allowed_invalid(self):
         miner = RecordingMiner()
-        class Args:
-            enabled = "maybe"
-        err = io.StringIO()
-        with redirect_stderr(err):
-            thermal.do_solo_allowed(miner, Args)
-        self.assertIn("solo must be 0/1", err.getvalue())
+        args = SimpleNamespace(enabled="maybe")
+        self.assertIn("solo must be 0/1", _stderr_of(thermal.do_solo_allowed, miner, args))
         self.assertIsNone(miner.last_ascset)
 
     def test_do_loop_get(self):
         miner = RecordingMiner()
-        class Args:
-            value = None
-        thermal.do_loop(miner, Args)
+        args = SimpleNamespace(value=None)
+        thermal.do_loop(miner, args)
         self.assertEqual(miner.last_ascset, "0,loop,get")
 
     def test_do_loop_set(self):
         miner = RecordingMiner()
-        class Args:
-            value = 160
-        thermal.do_loop(miner, Args)
+        args = SimpleNamespace(value=160)
+        thermal.do_loop(miner, args)
         self.assertEqual(miner.last_ascset, "0,loop,set,160")
 
     def test_do_timezone(self):
         miner = RecordingMiner()
-        class Args:
-            pass
-        thermal.do_timezone(miner, Args)
+        args = SimpleNamespace()
+        thermal.do_timezone(miner, args)
         self.assertEqual(miner.last_ascset, "0,time,get")
 
     def test_switchpool(self):
         miner = RecordingMiner()
-        class Args: id = 1
-        thermal.do_switchpool(miner, Args)
+        args = SimpleNamespace(id=1)
+        thermal.do_switchpool(miner, args)
         self.assertEqual(miner.last_cmd, "switchpool")
         self.assertEqual(miner.last_param, "1")
 
     def test_enablepool(self):
         miner = RecordingMiner()
-        class Args: id = 2
-        thermal.do_enablepool(miner, Args)
+        args = SimpleNamespace(id=2)
+        thermal.do_enablepool(miner, args)
         self.assertEqual(miner.last_cmd, "enablepool")
         self.assertEqual(miner.last_param, "2")
 
     def test_disablepool(self):
         miner = RecordingMiner()
-        class Args: id = 3
-        thermal.do_disablepool(miner, Args)
+        args = SimpleNamespace(id=3)
+        thermal.do_disablepool(miner, args)
         self.assertEqual(miner.last_cmd, "disablepool")
         self.assertEqual(miner.last_param, "3")
 
     def test_do_raw_with_param(self):
         miner = RecordingMiner()
-        class Args:
-            command = "switchpool"
-            param = "0"
-        out = io.StringIO()
-        with redirect_stdout(out):
-            thermal.do_raw(miner, Args)
+        args = SimpleNamespace(command="switchpool", param="0")
+        with redirect_stdout(_NULL):
+            thermal.do_raw(miner, args)
         self.assertEqual(miner.last_cmd, "switchpool")
         self.assertEqual(miner.last_param, "0")
 
     def test_do_raw_without_param(self):
         miner = RecordingMiner()
-        class Args:
-            command = "summary"
-            param = None
-        out = io.StringIO()
-        with redirect_stdout(out):
-            thermal.do_raw(miner, Args)
+        args = SimpleNamespace(command="summary", param=None)
+        with redirect_stdout(_NULL):
+            thermal.do_raw(miner, args)
         self.assertEqual(miner.last_cmd, "summary")
         self.assertIsNone(miner.last_param)
 
     def test_do_ascset_pass_through(self):
         miner = RecordingMiner()
-        class Args: param = "0,fan-spd,80"
-        out = io.StringIO()
-        with redirect_stdout(out):
-            thermal.do_ascset(miner, Args)
+        args = SimpleNamespace(param="0,fan-spd,80")
+        with redirect_stdout(_NULL):
+            thermal.do_ascset(miner, args)
         self.assertEqual(miner.last_ascset, "0,fan-spd,80")
 
     def test_status_compact_output(self):
         miner = RecordingMiner()
-        class Args: pass
+        args = SimpleNamespace()
         out = io.StringIO()
         with redirect_stdout(out):
-            thermal.do_status(miner, Args, compact=True)
+            thermal.do_status(miner, args, compact=True)
         self.assertIn("TH/s", out.getvalue())
 
 
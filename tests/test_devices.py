@@ -1,6 +1,7 @@
 """Integration tests for Avalon Mini 3 and Nano 3S devices."""
 
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 import thermal
 
@@ -15,20 +16,38 @@ def _status_ok(result):
     return status.get("STATUS") == "S"
 
 
-def _ascset_commands(miner):
-    result = miner.ascset("0,help")
+_ASCSET_COMMANDS = {}
+
+
+def _ascset_commands(host):
+    """Return (commands, raw reply) for ``ascset 0,help``.
+
+    A successful reply is fetched once per host; failures are not cached, so
+    a host that was briefly unreachable is asked again by the next test.
+    """
+    cached = _ASCSET_COMMANDS.get(host)
+    if cached is not None:
+        return cached
+    result = thermal.Miner(host, PORT, timeout=TIMEOUT).ascset("0,help")
     if not result or "STATUS" not in result:
-        return set(), result
+        return frozenset(), result
     msg = result["STATUS"][0].get("Msg", "")
     if ": " in msg:
         msg = msg.split(": ", 1)[1]
-    cmds = {cmd.strip() for cmd in msg.split("|") if cmd.strip()}
+    cmds = frozenset(cmd.strip() for cmd in msg.split("|") if cmd.strip())
+    _ASCSET_COMMANDS[host] = cmds, result
     return cmds, result
 
 
+_MM_VALUE_PATTERNS = {}
+
+
 def _extract_mm_value(mm_text, key):
-    pattern = re.escape(key) + r"\[([^\]]+)\]"
-    match = re.search(pattern, mm_text)
+    # Keys are plain alphanumerics (HBTemp, Fan1, ...), so no escaping is needed.
+    pattern = _MM_VALUE_PATTERNS.get(key)
+    if pattern is None:
+        pattern = _MM_VALUE_PATTERNS[key] = re.compile(key + r"\[([^\]]+)\]")
+    match = pattern.search(mm_text)
     if not match:
         return None
     return match.group(1)
@@ -39,24 +58,40 @@ class DeviceIntegrationTests(unittest.TestCase):
     def setUpClass(cls):
         if not HOSTS:
             raise unittest.SkipTest("No hosts configured")
+        cls._pool = ThreadPoolExecutor(max_workers=len(HOSTS))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._pool.shutdown()
 
-    def _miner(self, host):
-        return thermal.Miner(host, PORT, timeout=TIMEOUT)
+    def _for_each_host(self, fetch):
+        """Run fetch(host) for all hosts concurrently; yield (host, result) in HOSTS order.
 
-    def _require_online(self, host):
-        miner = self._miner(host)
-        ver = miner.cmd("version")
+        fetch does the network I/O only; assertions stay in the test thread.
+        """
+        return zip(HOSTS, self._pool.map(fetch, HOSTS))
+
+    def _query(self, host, *extra):
+        """Return (miner, version response, *responses for extra commands) in one round trip."""
+        miner = thermal.Miner(host, PORT, timeout=TIMEOUT)
+        return (miner, *miner.cmd_multi("version", *extra))
+
+    def _require_online(self, host, ver):
         if not ver or "VERSION" not in ver:
             msg = f"Host {host} offline or no version response"
             if SKIP_OFFLINE:
                 raise unittest.SkipTest(msg)
             self.fail(msg)
-        return miner, ver["VERSION"][0]
+        return ver["VERSION"][0]
+
+    def _query_ascset_help(self, host):
+        _, ver = self._query(host)
+        return ver, _ascset_commands(host) if ver else (frozenset(), None)
 
     def test_version_fields(self):
-        for host in HOSTS:
+        for host, (_, ver) in self._for_each_host(self._query):
             with self.subTest(host=host):
-                _, ver = self._require_online(host)
+                ver = self._require_online(host, ver)
                 prod = ver.get("PROD") or ver.get("MODEL") or ver.get("Model")
                 self.assertTrue(prod, f"missing PROD/MODEL in version: {ver}")
 
@@ -70,17 +105,19 @@ class DeviceIntegrationTests(unittest.TestCase):
                 self.assertTrue(firmware, f"missing firmware version in: {ver}")
 
     def test_dna_extraction(self):
-        for host in HOSTS:
+        def fetch(host):
+            miner, ver = self._query(host)
+            return ver, miner.get_dna() if ver else None
+
+        for host, (ver, dna) in self._for_each_host(fetch):
             with self.subTest(host=host):
-                miner, _ = self._require_online(host)
-                dna = miner.get_dna()
+                self._require_online(host, ver)
                 self.assertTrue(dna, "get_dna() returned empty")
 
     def test_summary(self):
-        for host in HOSTS:
+        for host, (_, ver, summary) in self._for_each_host(lambda host: self._query(host, "summary")):
             with self.subTest(host=host):
-                miner, _ = self._require_online(host)
-                summary = miner.cmd("summary")
+                self._require_online(host, ver)
                 self.assertTrue(summary and "SUMMARY" in summary, "summary missing SUMMARY")
                 s0 = summary["SUMMARY"][0]
                 has_rate_key = any(k in s0 for k in ("MHS av", "GHS av", "KHS av"))
@@ -88,10 +125,9 @@ class DeviceIntegrationTests(unittest.TestCase):
                 self.assertIn("Elapsed", s0, f"summary missing Elapsed: {s0}")
 
     def test_pools(self):
-        for host in HOSTS:
+        for host, (_, ver, pools) in self._for_each_host(lambda host: self._query(host, "pools")):
             with self.subTest(host=host):
-                miner, _ = self._require_online(host)
-                pools = miner.cmd("pools")
+                self._require_online(host, ver)
                 self.assertTrue(pools and "POOLS" in pools, "pools missing POOLS")
                 self.assertGreaterEqual(len(pools["POOLS"]), 1, "no pools configured")
                 p0 = pools["POOLS"][0]
@@ -99,11 +135,17 @@ class DeviceIntegrationTests(unittest.TestCase):
                     self.assertIn(key, p0, f"pool entry missing {key}: {p0}")
 
     def test_stats_parsing(self):
-        for host in HOSTS:
+        def fetch(host):
+            miner, ver = self._query(host)
+            if not ver or "VERSION" not in ver:
+                return miner, ver, None
+            ver0 = ver["VERSION"][0]
+            prod = ver0.get("PROD") or ver0.get("MODEL") or ver0.get("Model")
+            return miner, ver, miner.parse_stats(thermal.device_key_from_product(prod), version_entry=ver0)
+
+        for host, (miner, ver, stats) in self._for_each_host(fetch):
             with self.subTest(host=host):
-                miner, ver = self._require_online(host)
-                prod = ver.get("PROD") or ver.get("MODEL") or ver.get("Model")
-                stats = miner.parse_stats(thermal.device_key_from_product(prod), version_entry=ver)
+                self._require_online(host, ver)
                 if not stats:
                     raw = miner.cmd("stats") or {}
                     mm_ids = [s.get("MM ID0") for s in raw.get("STATS", []) if "MM ID0" in s]
@@ -138,11 +180,11 @@ class DeviceIntegrationTests(unittest.TestCase):
                 self.assertGreaterEqual(stats["uptime"], 0)
 
     def test_stats_parse_consistency_with_raw(self):
-        for host in HOSTS:
+        for host, (_, ver, raw) in self._for_each_host(lambda host: self._query(host, "stats")):
             with self.subTest(host=host):
-                miner, ver = self._require_online(host)
+                ver = self._require_online(host, ver)
                 prod = (ver.get("PROD") or ver.get("MODEL") or "").lower()
-                raw = miner.cmd("stats") or {}
+                raw = raw or {}
                 mm_list = [s.get("MM ID0") for s in raw.get("STATS", []) if "MM ID0" in s]
                 if "avalon q" in prod or prod.strip() == "q":
                     if not mm_list:
@@ -184,21 +226,19 @@ class DeviceIntegrationTests(unittest.TestCase):
 
     def test_ascset_help_core_commands(self):
         expected = {"fan-spd", "frequency", "workmode", "worklevel"}
-        for host in HOSTS:
+        for host, (ver, (cmds, result)) in self._for_each_host(self._query_ascset_help):
             with self.subTest(host=host):
-                miner, _ = self._require_online(host)
-                cmds, result = _ascset_commands(miner)
+                self._require_online(host, ver)
                 self.assertTrue(result and "STATUS" in result, "ascset help missing STATUS")
                 self.assertTrue(cmds, "ascset help missing commands list")
                 missing = sorted(expected - cmds)
                 self.assertFalse(missing, f"ascset help missing {missing}. got: {sorted(cmds)}")
 
     def test_ascset_help_product_specific(self):
-        for host in HOSTS:
+        for host, (ver, (cmds, result)) in self._for_each_host(self._query_ascset_help):
             with self.subTest(host=host):
-                miner, ver = self._require_online(host)
+                ver = self._require_online(host, ver)
                 prod = (ver.get("PROD") or ver.get("MODEL") or "").lower()
-                cmds, result = _ascset_commands(miner)
                 self.assertTrue(result and "STATUS" in result, "ascset help missing STATUS")
                 self.assertTrue(cmds, "ascset help missing commands list")
 
@@ -221,18 +261,15 @@ class DeviceWriteSmokeTests(unittest.TestCase):
         if not HOSTS:
             raise unittest.SkipTest("No hosts configured")
 
-    def _miner(self, host):
-        return thermal.Miner(host, PORT, timeout=TIMEOUT)
-
     def _require_online(self, host):
-        miner = self._miner(host)
+        miner = thermal.Miner(host, PORT, timeout=TIMEOUT)
         ver = miner.cmd("version")
         if not ver or "VERSION" not in ver:
             msg = f"Host {host} offline or no version response"
             if SKIP_OFFLINE:
                 raise unittest.SkipTest(msg)
             self.fail(msg)
-        return miner
+        return miner, ver["VERSION"][0] if ver["VERSION"] else {}
 
     def _assert_status_success(self, result, label):
         self.assertTrue(_status_ok(result), f"{label} failed: {result}")
@@ -240,9 +277,7 @@ class DeviceWriteSmokeTests(unittest.TestCase):
     def test_write_noop_commands(self):
         for host in HOSTS:
             with self.subTest(host=host):
-                miner = self._require_online(host)
-                ver = miner.cmd("version")
-                ver0 = ver["VERSION"][0] if ver and "VERSION" in ver and ver["VERSION"] else {}
+                miner, ver0 = self._require_online(host)
                 prod = ver0.get("PROD") or ver0.get("MODEL") or ver0.get("Model")
                 stats = miner.parse_stats(thermal.device_key_from_product(prod), version_entry=ver0)
                 if not stats:
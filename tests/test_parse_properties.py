@@ -2,137 +2,175 @@
 
 import random
 import unittest
+from functools import lru_cache
 
 import thermal
 
 
 def _build_mm(fields):
-    parts = []
-    for key, value in fields.items():
-        parts.append(f"{key}[{value}]")
-    return " ".join(parts)
+    return " ".join([f"{key}[{value}]" for key, value in fields.items()])
 
 
 def _rand_range(rng, low, high):
     return rng.randint(low, high)
 
 
+_EXACT_KEYS = (
+    "temp", "temp_max", "fan_pct", "fan_rpm", "freq", "voltage", "power_in", "power_out",
+    "workmode", "worklevel", "hw_errors", "dna",
+)
+_APPROX_KEYS = ("dh_rate", "hashrate", "hashrate_max")
+
+
+def _parse_mismatches(dataset):
+    """Parse every sample and return (index, key, expected, actual) for each wrong field.
+
+    Approximate keys use assertAlmostEqual's places=3 rule.
+    """
+    mismatches = []
+    for index, (expected, mm) in enumerate(dataset):
+        stats = thermal.parse_mm_id0(mm)
+        for key in _EXACT_KEYS:
+            if stats[key] != expected[key]:
+                mismatches.append((index, key, expected[key], stats[key]))
+        for key in _APPROX_KEYS:
+            if round(stats[key] - expected[key], 3) != 0:
+                mismatches.append((index, key, expected[key], stats[key]))
+    return mismatches
+
+
+@lru_cache(maxsize=2)
+def _mini3_dataset(seed=1337):
+    """Return (expected stats, MM ID0) pairs; fixed for a given seed, so built once."""
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(50):
+        hbtemp = _rand_range(rng, 40, 90)
+        tmax = hbtemp + _rand_range(rng, 1, 10)
+        fan_pct = _rand_range(rng, 15, 100)
+        fan_rpm = _rand_range(rng, 600, 4000)
+        freq = _rand_range(rng, 400, 700)
+        voltage = _rand_range(rng, 1800, 2200)
+        ghsavg = rng.uniform(10000, 50000)
+        ghsmm = ghsavg + rng.uniform(0, 5000)
+        uptime = _rand_range(rng, 10, 100000)
+        dh = rng.uniform(0, 10)
+        hw = _rand_range(rng, 0, 10)
+        workmode = rng.choice([0, 1, 2])
+        worklevel = _rand_range(rng, 0, 5)
+        power_in = _rand_range(rng, 600, 1500)
+        power_out = _rand_range(rng, 400, 1000)
+        dna = "02" + "%014x" % _rand_range(rng, 0, 0xFFFFFFFFFFFF)
+
+        fields = {
+            "GHSavg": f"{ghsavg:.2f}",
+            "GHSmm": f"{ghsmm:.2f}",
+            "Elapsed": str(uptime),
+            "HBTemp": str(hbtemp),
+            "TMax": str(tmax),
+            "Fan1": str(fan_rpm),
+            "FanR": f"{fan_pct}%",
+            "SF0": f"{freq} {freq+18} {freq+39} {freq+60}",
+            "ATA1": f"750-75-{voltage}-492-20",
+            "PS": f"0 {power_in} 2050 34 {power_out} 2050 737",
+            "WORKMODE": str(workmode),
+            "WORKLVL": str(worklevel),
+            "HW": str(hw),
+            "DH": f"{dh:.3f}%",
+            "DNA": dna,
+        }
+
+        expected = {
+            "temp": hbtemp,
+            "temp_max": tmax,
+            "fan_pct": fan_pct,
+            "fan_rpm": fan_rpm,
+            "freq": freq,
+            "voltage": voltage,
+            "power_in": power_in,
+            "power_out": power_out,
+            "workmode": workmode,
+            "worklevel": worklevel,
+            "hw_errors": hw,
+            "dh_rate": dh,
+            "dna": dna.lower(),
+            "hashrate": ghsavg / 1000,
+            "hashrate_max": ghsmm / 1000,
+        }
+        samples.append((expected, _build_mm(fields)))
+    return tuple(samples)
+
+
 class ParseMini3Properties(unittest.TestCase):
     def test_random_mini3_fields(self):
-        rng = random.Random(1337)
-        for _ in range(50):
-            hbtemp = _rand_range(rng, 40, 90)
-            tmax = hbtemp + _rand_range(rng, 1, 10)
-            fan_pct = _rand_range(rng, 15, 100)
-            fan_rpm = _rand_range(rng, 600, 4000)
-            freq = _rand_range(rng, 400, 700)
-            voltage = _rand_range(rng, 1800, 2200)
-            ghsavg = rng.uniform(10000, 50000)
-            ghsmm = ghsavg + rng.uniform(0, 5000)
-            uptime = _rand_range(rng, 10, 100000)
-            dh = rng.uniform(0, 10)
-            hw = _rand_range(rng, 0, 10)
-            workmode = rng.choice([0, 1, 2])
-            worklevel = _rand_range(rng, 0, 5)
-            power_in = _rand_range(rng, 600, 1500)
-            power_out = _rand_range(rng, 400, 1000)
-            dna = "02" + "%014x" % _rand_range(rng, 0, 0xFFFFFFFFFFFF)
-
-            fields = {
-                "GHSavg": f"{ghsavg:.2f}",
-                "GHSmm": f"{ghsmm:.2f}",
-                "Elapsed": str(uptime),
-                "HBTemp": str(hbtemp),
-                "TMax": str(tmax),
-                "Fan1": str(fan_rpm),
-                "FanR": f"{fan_pct}%",
-                "SF0": f"{freq} {freq+18} {freq+39} {freq+60}",
-                "ATA1": f"750-75-{voltage}-492-20",
-                "PS": f"0 {power_in} 2050 34 {power_out} 2050 737",
-                "WORKMODE": str(workmode),
-                "WORKLVL": str(worklevel),
-                "HW": str(hw),
-                "DH": f"{dh:.3f}%",
-                "DNA": dna,
-            }
-
-            mm = _build_mm(fields)
-            stats = thermal.parse_mm_id0(mm)
-
-            self.assertEqual(stats["temp"], hbtemp)
-            self.assertEqual(stats["temp_max"], tmax)
-            self.assertEqual(stats["fan_pct"], fan_pct)
-            self.assertEqual(stats["fan_rpm"], fan_rpm)
-            self.assertEqual(stats["freq"], freq)
-            self.assertEqual(stats["voltage"], voltage)
-            self.assertEqual(stats["power_in"], power_in)
-            self.assertEqual(stats["power_out"], power_out)
-            self.assertEqual(stats["workmode"], workmode)
-            self.assertEqual(stats["worklevel"], worklevel)
-            self.assertEqual(stats["hw_errors"], hw)
-            self.assertAlmostEqual(stats["dh_rate"], dh, places=3)
-            self.assertEqual(stats["dna"], dna.lower())
-            self.assertAlmostEqual(stats["hashrate"], ghsavg / 1000, places=3)
-            self.assertAlmostEqual(stats["hashrate_max"], ghsmm / 1000, places=3)
+        self.assertEqual(_parse_mismatches(_mini3_dataset()), [])
+
+
+@lru_cache(maxsize=2)
+def _nano3s_dataset(seed=4242):
+    """Return (expected stats, MM ID0) pairs; fixed for a given seed, so built once."""
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(50):
+        otemp = _rand_range(rng, 40, 90)
+        tmax = otemp + _rand_range(rng, 1, 10)
+        fan_pct = _rand_range(rng, 15, 100)
+        fan_rpm = _rand_range(rng, 600, 2500)
+        freq = _rand_range(rng, 450, 650)
+        voltage = _rand_range(rng, 3000, 3800)
+        ghsavg = rng.uniform(1000, 8000)
+        ghsmm = ghsavg + rng.uniform(0, 2000)
+        uptime = _rand_range(rng, 10, 100000)
+        dh = rng.uniform(0, 40)
+        hw = _rand_range(rng, 0, 5)
+        workmode = rng.choice([0, 1, 2])
+        worklevel = _rand_range(rng, 0, 3)
+        power_in = _rand_range(rng, 0, 150)
+        power_out = _rand_range(rng, 0, 150)
+        dna = "02" + "%014x" % _rand_range(rng, 0, 0xFFFFFFFFFFFF)
+
+        fields = {
+            "GHSavg": f"{ghsavg:.2f}",
+            "GHSmm": f"{ghsmm:.2f}",
+            "Elapsed": str(uptime),
+            "OTemp": str(otemp),
+            "TMax": str(tmax),
+            "Fan1": str(fan_rpm),
+            "FanR": f"{fan_pct}%",
+            "SF0": f"{freq} {freq+18} {freq+39} {freq+60}",
+            "ATA1": f"95-85-{voltage}-332-20",
+            "PS": f"0 {power_in} 27601 4 {power_out} 3210 114",
+            "WORKMODE": str(workmode),
+            "WORKLEVEL": str(worklevel),
+            "HW": str(hw),
+            "DH": f"{dh:.3f}%",
+            "DNA": dna.upper(),
+        }
+
+        expected = {
+            "temp": otemp,
+            "temp_max": tmax,
+            "fan_pct": fan_pct,
+            "fan_rpm": fan_rpm,
+            "freq": freq,
+            "voltage": voltage,
+            "power_in": power_in,
+            "power_out": power_out,
+            "workmode": workmode,
+            "worklevel": worklevel,
+            "hw_errors": hw,
+            "dh_rate": dh,
+            "dna": dna.lower(),
+            "hashrate": ghsavg / 1000,
+            "hashrate_max": ghsmm / 1000,
+        }
+        samples.append((expected, _build_mm(fields)))
+    return tuple(samples)
 
 
 class ParseNano3sProperties(unittest.TestCase):
     def test_random_nano3s_fields(self):
-        rng = random.Random(4242)
-        for _ in range(50):
-            otemp = _rand_range(rng, 40, 90)
-            tmax = otemp + _rand_range(rng, 1, 10)
-            fan_pct = _rand_range(rng, 15, 100)
-            fan_rpm = _rand_range(rng, 600, 2500)
-            freq = _rand_range(rng, 450, 650)
-            voltage = _rand_range(rng, 3000, 3800)
-            ghsavg = rng.uniform(1000, 8000)
-            ghsmm = ghsavg + rng.uniform(0, 2000)
-            uptime = _rand_range(rng, 10, 100000)
-            dh = rng.uniform(0, 40)
-            hw = _rand_range(rng, 0, 5)
-            workmode = rng.choice([0, 1, 2])
-            worklevel = _rand_range(rng, 0, 3)
-            power_in = _rand_range(rng, 0, 150)
-            power_out = _rand_range(rng, 0, 150)
-            dna = "02" + "%014x" % _rand_range(rng, 0, 0xFFFFFFFFFFFF)
-
-            fields = {
-                "GHSavg": f"{ghsavg:.2f}",
-                "GHSmm": f"{ghsmm:.2f}",
-                "Elapsed": str(uptime),
-                "OTemp": str(otemp),
-                "TMax": str(tmax),
-                "Fan1": str(fan_rpm),
-                "FanR": f"{fan_pct}%",
-                "SF0": f"{freq} {freq+18} {freq+39} {freq+60}",
-                "ATA1": f"95-85-{voltage}-332-20",
-                "PS": f"0 {power_in} 27601 4 {power_out} 3210 114",
-                "WORKMODE": str(workmode),
-                "WORKLEVEL": str(worklevel),
-                "HW": str(hw),
-                "DH": f"{dh:.3f}%",
-                "DNA": dna.upper(),
-            }
-
-            mm = _build_mm(fields)
-            stats = thermal.parse_mm_id0(mm)
-
-            self.assertEqual(stats["temp"], otemp)
-            self.assertEqual(stats["temp_max"], tmax)
-            self.assertEqual(stats["fan_pct"], fan_pct)
-            self.assertEqual(stats["fan_rpm"], fan_rpm)
-            self.assertEqual(stats["freq"], freq)
-            self.assertEqual(stats["voltage"], voltage)
-            self.assertEqual(stats["power_in"], power_in)
-            self.assertEqual(stats["power_out"], power_out)
-            self.assertEqual(stats["workmode"], workmode)
-            self.assertEqual(stats["worklevel"], worklevel)
-            self.assertEqual(stats["hw_errors"], hw)
-            self.assertAlmostEqual(stats["dh_rate"], dh, places=3)
-            self.assertEqual(stats["dna"], dna.lower())
-            self.assertAlmostEqual(stats["hashrate"], ghsavg / 1000, places=3)
-            self.assertAlmostEqual(stats["hashrate_max"], ghsmm / 1000, places=3)
+        self.assertEqual(_parse_mismatches(_nano3s_dataset()), [])
 
     def test_invalid_itemp_falls_back_to_zero(self):
         fields = {
@@ -155,6 +193,28 @@ class ParseNano3sProperties(unittest.TestCase):
         stats = thermal.parse_mm_id0(mm)
         self.assertEqual(stats["temp"], 0)
 
+    def test_keys_match_whole_tokens(self):
+        mm = _build_mm({
+            "DHW": "9",
+            "HW": "2",
+            "HBOTemp": "77",
+            "OTemp": "55",
+            "SF0": "500 518 539 560",
+            "DNA": "0201000073d19147",
+        })
+        stats = thermal.parse_mm_id0(mm)
+        self.assertEqual(stats["hw_errors"], 2)
+        self.assertEqual(stats["temp"], 55)
+        self.assertEqual(stats["freq"], 500)
+
+    def test_cached_parse_returns_independent_copies(self):
+        mm = _build_mm({"HBTemp": "61", "Elapsed": "42", "DNA": "0201000073d19147"})
+        first = thermal.parse_mm_id0(mm)
+        first["temp"] = -1
+        second = thermal.parse_mm_id0(mm)
+        self.assertEqual(second["temp"], 61)
+        self.assertEqual(thermal.parse_mm_id0(mm, temp_keys=["TMax"])["temp"], 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,193 @@
+"""Unit tests for password recovery hashing and candidate workers."""
+
+import os
+import tempfile
+import unittest
+from itertools import product
+from unittest import mock
+
+import password
+
+DNA = "0201000046d3803b"
+
+
+def _args(payload, secret):
+    return (payload, bytes.fromhex(password.compute_auth(secret, DNA)), DNA.encode())
+
+
+class HashTests(unittest.TestCase):
+    def test_compute_auth_fast_matches_reference(self):
+        for secret in ("", "admin", "p@ssw0rd!", "0123456789abcdef"):
+            self.assertEqual(
+                password.compute_auth_fast(secret, DNA.encode()),
+                password.compute_auth(secret, DNA),
+            )
+
+    def test_check_password_batch(self):
+        self.assertEqual(password.check_password_batch(_args([b"x", b"admin", b"y"], "admin")), "admin")
+        self.assertIsNone(password.check_password_batch(_args([b"x", b"y"], "admin")))
+
+    def test_check_rules_batch_covers_apply_rules(self):
+        for secret in password.apply_rules("Tollies"):
+            self.assertEqual(password.check_rules_batch(_args(["x", "Tollies"], secret)), secret)
+        self.assertIsNone(password.check_rules_batch(_args(["Tollies"], "tollies2019")))
+
+
+class GeneratorTests(unittest.TestCase):
+    def test_generators_follow_product_order(self):
+        expected = [""] + ["".join(c) for n in range(1, 4) for c in product("abc", repeat=n)]
+        self.assertEqual(list(password.generate_bruteforce("abc", 3, 0)), expected)
+        expected = ["".join(c) for c in product("x", password.CHARSET_DIGITS, password.CHARSET_LOWER)]
+        self.assertEqual(list(password.generate_mask_candidates("x?d?l")), expected)
+
+    def test_apply_rules_dedups_and_caps_length(self):
+        words = ["Password", "admin", "x" * 15]
+        candidates = [c for word in words for c in password.apply_rules(word)]
+        self.assertEqual(len(set(password.apply_rules("admin"))), len(list(password.apply_rules("admin"))))
+        self.assertTrue(all(0 < len(c) <= 16 for c in candidates))
+
+    def test_generate_hybrid_caps_length(self):
+        candidates = list(password.generate_hybrid(["fifteen-chars!!"], 2))
+        self.assertEqual(len(candidates), 1 + len(password.CHARSET_DIGITS + password.CHARSET_SPECIAL_COMMON))
+        self.assertTrue(all(len(c) <= 16 for c in candidates))
+
+
+class PrefixWorkerTests(unittest.TestCase):
+    def test_mask_split_finds_password(self):
+        charsets = password.parse_mask("ab?d?d?l")
+        head, tail, tail_count = password.split_charsets(charsets, 50)
+        self.assertEqual(len(head) + len(tail), len(charsets))
+        self.assertGreaterEqual(tail_count, 50)
+        found = None
+        for payload, _ in password.keyspace_tasks(charsets, 50):
+            found = found or password.check_keyspace_slice(_args(payload, "ab42z"))
+        self.assertEqual(found, "ab42z")
+
+    def test_decode_prefix_matches_product_order(self):
+        head = ("ab", "0123", "xyz")
+        expected = ["".join(combo) for combo in product(*head)]
+        self.assertEqual([password.decode_prefix(head, i) for i in range(len(expected))], expected)
+
+    def test_keyspace_tasks_cover_bruteforce_space(self):
+        charsets = [password.CHARSET_DIGITS] * 4
+        tasks = list(password.keyspace_tasks(charsets, 300))
+        self.assertEqual(sum(count for _, count in tasks), 10 ** 4)
+        found = [password.check_keyspace_slice(_args(payload, "0917")) for payload, _ in tasks]
+        self.assertEqual([f for f in found if f], ["0917"])
+
+    def test_hybrid_respects_max_len(self):
+        spec = tuple((password.CHARSET_DIGITS,) * n for n in range(3))
+        payload = ([b"fifteen-chars!!"], spec, 16)
+        self.assertEqual(password.check_prefix_batch(_args(payload, "fifteen-chars!!7")), "fifteen-chars!!7")
+        self.assertIsNone(password.check_prefix_batch(_args(payload, "fifteen-chars!!77")))
+
+    def test_hybrid_non_ascii_matches_generate_hybrid(self):
+        word = "пароль" * 2 + "ab"  # 14 characters, 26 bytes
+        spec = tuple((password.CHARSET_DIGITS + password.CHARSET_SPECIAL_COMMON,) * n for n in range(3))
+        payload = ([word.encode()], spec, 16)
+        expected = list(password.generate_hybrid([word], 2))
+        self.assertEqual(len(expected), 1 + 20 + 400)
+        for secret in expected[::37] + expected[-1:]:
+            self.assertEqual(password.check_prefix_batch(_args(payload, secret)), secret)
+        self.assertIsNone(password.check_prefix_batch(_args(payload, word + "123")))
+
+    def test_hybrid_bare_word_beyond_max_len(self):
+        long_word = "x" * 20
+        spec = tuple((password.CHARSET_DIGITS,) * n for n in range(2))
+        payload = ([long_word.encode()], spec, 16)
+        self.assertEqual(password.check_prefix_batch(_args(payload, long_word)), long_word)
+
+
+class WordlistSliceTests(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"alpha\r\n\nbeta\ngamma\ndelta\nepsilon\nzeta")
+        self.addCleanup(os.remove, self.path)
+
+    def test_ranges_cover_every_word_once(self):
+        line_count, ranges = password.wordlist_ranges(self.path, 2)
+        self.assertEqual(line_count, 7)
+        words = [w for start, end, _ in ranges for w in password.read_words(self.path, start, end)]
+        self.assertEqual(words, [b"alpha", b"beta", b"gamma", b"delta", b"epsilon", b"zeta"])
+
+    def test_non_ascii_words_and_rules(self):
+        with open(self.path, "wb") as f:
+            f.write("pässwort\n".encode() + b"bad\xffbyte\n")
+        _, ranges = password.wordlist_ranges(self.path, 10)
+        (start, end, _), = ranges
+        self.assertEqual(password.read_words(self.path, start, end), ["pässwort".encode(), b"badbyte"])
+        self.assertEqual(password.check_wordlist_slice(_args((self.path, start, end, True), "Pässwort1")), "Pässwort1")
+
+    def test_wordlist_and_hybrid_workers(self):
+        _, ranges = password.wordlist_ranges(self.path, 3)
+        ranges = list(ranges)
+        found = [password.check_wordlist_slice(_args((self.path, s, e, False), "zeta")) for s, e, _ in ranges]
+        self.assertEqual([f for f in found if f], ["zeta"])
+        spec = tuple((password.CHARSET_DIGITS,) * n for n in range(3))
+        found = [password.check_hybrid_slice(_args((self.path, s, e, spec, 16), "gamma42")) for s, e, _ in ranges]
+        self.assertEqual([f for f in found if f], ["gamma42"])
+
+    def test_empty_wordlist(self):
+        with open(self.path, "wb"):
+            pass
+        line_count, ranges = password.wordlist_ranges(self.path, 10)
+        self.assertEqual((line_count, list(ranges)), (0, []))
+
+
+class _FakeSocket:
+    def __init__(self, *chunks):
+        self.chunks = list(chunks)
+
+    def settimeout(self, timeout):
+        pass
+
+    def setsockopt(self, level, option, value):
+        pass
+
+    def connect(self, address):
+        pass
+
+    def send(self, data):
+        return len(data)
+
+    def recv_into(self, buffer):
+        chunk = self.chunks.pop(0) if self.chunks else b""
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+    def close(self):
+        pass
+
+
+class FetchDeviceInfoTests(unittest.TestCase):
+    def _fetch(self, auth_body, *stats_chunks):
+        response = mock.Mock()
+        response.read.return_value = auth_body
+        with mock.patch("password.urllib.request.urlopen", return_value=response), \
+                mock.patch("password.socket.socket", return_value=_FakeSocket(*stats_chunks)):
+            return password.fetch_device_info("192.0.2.1")
+
+    def test_parses_auth_and_dna(self):
+        result = self._fetch(
+            b'{"auth":"abcd1234","ok":1}',
+            b'{"STATS":[{"MM ID0":"Ver[1] DNA[0201',
+            b'000046d3803b] Elapsed[5]"}]}\x00',
+        )
+        self.assertEqual(result, ("abcd1234", DNA))
+
+    def test_large_stats_reply_grows_buffer(self):
+        padding = b" " * 70000
+        chunks = [padding[i:i + 4096] for i in range(0, len(padding), 4096)]
+        result = self._fetch(b'{"auth":"abcd1234"}', *chunks, b'"MM ID0":"DNA[' + DNA.encode() + b']"')
+        self.assertEqual(result, ("abcd1234", DNA))
+
+    def test_missing_fields_raise(self):
+        with self.assertRaises(ValueError):
+            self._fetch(b'{"ok":1}', b"{}")
+        with self.assertRaises(ValueError):
+            self._fetch(b'{"auth":"abcd1234"}', b'{"MM ID0":"Ver[1] DNA[')
+
+
+if __name__ == "__main__":
+    unittest.main()
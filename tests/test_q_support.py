@@ -1,6 +1,10 @@
 """Unit tests for Avalon Q-specific parsing and auth behavior."""
 
+import hashlib
+import io
 import unittest
+from contextlib import redirect_stdout
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import thermal
@@ -96,10 +100,80 @@ class QSupportTests(unittest.TestCase):
         self.assertAlmostEqual(stats["dh_rate"], 1.7, places=2)
         self.assertEqual(stats["dna"], "020100003b70fee3")
 
+    def test_fallback_batches_report_commands(self):
+        miner = QApiMiner()
+        sent = []
+        reply = miner.cmd
+
+        def multi(command, param=None):
+            sent.append(command)
+            if "+" in command:
+                return {name: [reply(name)] for name in command.split("+")}
+            return reply(command, param)
+
+        with patch.object(miner, "cmd", side_effect=multi):
+            stats = miner.parse_stats("q", stats=reply("stats"))
+        self.assertEqual(sent, ["summary+devs+version"])
+        self.assertEqual((stats["temp"], stats["dna"]), (67, "020100003b70fee3"))
+        sent.clear()
+        with patch.object(miner, "cmd", side_effect=multi):
+            miner.parse_stats("q", version_entry={"PROD": "Avalon Q"}, stats=reply("stats"))
+            miner.parse_stats("q", version_entry={}, stats=reply("stats"))
+        self.assertEqual(sent, ["summary+devs", "summary+devs"])
+
+    def test_fallback_skips_ascset_when_offline(self):
+        miner = QApiMiner()
+        with patch.object(miner, "cmd", return_value=None) as cmd, patch.object(miner, "ascset") as ascset:
+            self.assertEqual(miner._parse_fallback_stats(version_entry={}), {})
+        self.assertEqual([call.args[0] for call in cmd.call_args_list], ["summary+devs"])
+        ascset.assert_not_called()
+
+    def test_watch_polls_q_without_stats(self):
+        miner = QApiMiner()
+        sent = []
+        reply = miner.cmd
+
+        def record(command, param=None):
+            sent.append(command)
+            return reply(command, param)
+
+        args = SimpleNamespace(interval=0)
+        with patch.object(miner, "cmd", side_effect=record), \
+                patch("thermal.time.sleep", side_effect=[None, KeyboardInterrupt]), \
+                redirect_stdout(io.StringIO()) as out:
+            thermal.do_watch(miner, args)
+        # The mock has no multi-command support, so each batch is retried per command.
+        self.assertEqual(sent[:3], ["version+stats", "version", "stats"])
+        self.assertEqual(sent[3:], ["summary+devs", "summary", "devs"] * 2)
+        self.assertEqual(out.getvalue().count("52.0 TH/s"), 2)
+
+    def test_parse_stats_data_needs_mm_id0(self):
+        self.assertIsNone(thermal.parse_stats_data(None))
+        self.assertIsNone(thermal.parse_stats_data(QApiMiner().cmd("stats")))
+        stats = thermal.parse_stats_data({"STATS": [{"ID": "POOL0"}, {"MM ID0": "Elapsed[42] HBTemp[61]"}]})
+        self.assertEqual((stats["uptime"], stats["temp"]), (42, 61))
+
+    def test_parse_stats_remembers_dna(self):
+        miner = QApiMiner()
+        miner.parse_stats("q")
+        with patch.object(miner, "cmd", side_effect=AssertionError("unexpected request")):
+            self.assertEqual(miner.get_dna(), "020100003b70fee3")
+
     def test_get_dna_falls_back_to_version(self):
         miner = QApiMiner()
         self.assertEqual(miner.get_dna(), "020100003b70fee3")
 
+    def test_compute_auth_is_cached_per_password(self):
+        miner = QApiMiner()
+        creds = miner.compute_auth("secret")
+        webpass = hashlib.sha256(b"secret").hexdigest()
+        expected_auth = hashlib.sha256((webpass[:8] + "020100003b70fee3").encode()).hexdigest()[:8]
+        self.assertEqual(creds["auth"], expected_auth)
+        creds["auth"] = "changed"
+        self.assertEqual(miner.compute_auth("secret")["auth"], expected_auth)
+        self.assertNotEqual(miner.compute_auth("other")["auth"], expected_auth)
+        self.assertNotIn("secret", {password for password, _ in miner._auth_cache})
+
     def test_web_auth_parses_spaced_jsonp(self):
         miner = thermal.Miner("192.168.130.53")
 
@@ -117,6 +191,23 @@ class QSupportTests(unittest.TestCase):
             cookie = miner.web_auth("dummy-password")
         self.assertEqual(cookie, "aaaabbbbccccdddd")
 
+    def test_web_auth_accepts_code_before_auth(self):
+        miner = thermal.Miner("192.168.130.53")
+
+        class _Resp:
+            def read(self):
+                return b'getCookieCallback({"code": "ccccdddd",\n "auth": "aaaabbbb"});'
+
+        with patch.object(
+            thermal.Miner,
+            "compute_auth",
+            return_value={"auth": "a", "verify": "b", "cookie": "fallback-cookie"},
+        ), patch.object(thermal.Miner, "ascset", return_value={"STATUS": [{"STATUS": "S"}]}), patch(
+            "urllib.request.urlopen", return_value=_Resp()
+        ):
+            cookie = miner.web_auth("dummy-password")
+        self.assertEqual(cookie, "aaaabbbbccccdddd")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,19 +2,29 @@
 """Thermal Key device control tool via CGMiner API (port 4028)."""
 
 import argparse
+import errno
 import hashlib
 import io
 import json
 import os
 import re
+import selectors
 import socket
 import sys
+import threading
 import time
 import urllib.request
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from contextlib import redirect_stdout, redirect_stderr
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from collections import deque
+from contextlib import contextmanager, redirect_stdout, redirect_stderr
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import orjson  # optional: faster parsing of large stats replies
+except ImportError:
+    orjson = None
+
 # Work mode name mappings (0=Heater, 1=Mining, 2=Night)
 MODE_NAMES = {0: "Heater", 1: "Mining", 2: "Night"}
 MODE_ABBREV = {0: "H", 1: "M", 2: "N"}
@@ -32,13 +42,61 @@ DEVICE_TEMP_KEYS = {
     "q": DEFAULT_TEMP_KEYS,
 }
 
+# MM ID0 is a run of KEY[value] tokens. Fields with a stricter value syntax
+# are validated against these patterns after tokenizing.
+_MM_TOKEN_RE = re.compile(r"([A-Za-z0-9_]+)\[([^\]]+)\]")
+_MM_VALUE_RES = {
+    "GHSavg": re.compile(r"([0-9.]+)"),
+    "GHSmm": re.compile(r"([0-9.]+)"),
+    "Elapsed": re.compile(r"(\d+)"),
+    "WORKMODE": re.compile(r"(\d+)"),
+    "WORKLVL": re.compile(r"(\d+)"),
+    "WORKLEVEL": re.compile(r"(\d+)"),
+    "HW": re.compile(r"(\d+)"),
+    "DH": re.compile(r"([0-9.]+)%?"),
+    "DNA": re.compile(r"([0-9a-fA-F]+)"),
+}
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+_INT_RE = re.compile(r"-?\d+")
+_DNA_RE = re.compile(r"DNA\[([0-9a-fA-F]+)\]")
+
+# ascset status messages (Avalon Q)
+_PS_RE = re.compile(r"PS\[([^\]]+)\]")
+_LOOP_RE = re.compile(r"LOOP\[\s*(\d+)")
+_WORKMODE_RE = re.compile(r"workmode\s+(\d+)")
+_WORKLEVEL_RE = re.compile(r"worklevel\s+(\d+)")
+
+# Product name matching
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_AVALON_Q_RE = re.compile(r"\bavalon\s*q\b")
+_Q_WORD_RE = re.compile(r"\bq\b")
+
+# Web UI JSON replies
+_AUTH_RE = re.compile(r'"auth"\s*:\s*"([^"]+)"')
+_CODE_RE = re.compile(r'"code"\s*:\s*"([^"]+)"')
+
+
+def _mm_fields(mm: str) -> Dict[str, str]:
+    """Split an MM ID0 payload into {key: value} in one scan; the first of repeated keys wins."""
+    # Building the dict from the reversed token list lets earlier tokens
+    # overwrite later ones without a Python-level loop.
+    return dict(reversed(_MM_TOKEN_RE.findall(mm)))
+
+
+def _int_text(value) -> int:
+    """int(float(value)), skipping the float for plain integer input."""
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
 
 def _to_int(value, default: int = 0) -> int:
     """Best-effort integer parser for mixed API payloads."""
     if value is None:
         return default
     try:
-        return int(float(value))
+        return _int_text(value)
     except (TypeError, ValueError):
         return default
 
@@ -52,6 +110,27 @@ def _to_float(value, default: float = 0.0) -> float:
         return default
 
 
+def _loads_reply(data: bytes):
+    """Decode a CGMiner JSON reply, with orjson when it is installed.
+
+    orjson is stricter than json (no NaN, 64-bit integers), so anything it
+    rejects is retried with the standard library.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _split_multi_reply(reply: Optional[Dict], commands) -> Optional[List[Dict]]:
+    """Unwrap a "+"-joined command reply into per-command replies, or None if it is not one."""
+    if reply and all(isinstance(reply.get(command), list) and reply[command] for command in commands):
+        return [reply[command][0] for command in commands]
+    return None
+
+
 def _status_msg(result: Optional[Dict]) -> str:
     if not result:
         return ""
@@ -60,40 +139,50 @@ def _status_msg(result: Optional[Dict]) -> str:
 
 def _extract_ps_values(msg: str) -> Tuple[int, int, int]:
     """Extract (power_in, voltage, power_out) from a PS[...] status message."""
-    match = re.search(r"PS\[([^\]]+)\]", msg)
+    match = _PS_RE.search(msg)
     if not match:
         return 0, 0, 0
-    values = [_to_int(p, 0) for p in re.findall(r"-?\d+(?:\.\d+)?", match.group(1))]
+    values = [_to_int(p, 0) for p in _NUMBER_RE.findall(match.group(1))]
     if len(values) > 4:
         return values[1], values[2], values[4]
     return 0, 0, 0
 
 
 def _extract_loop_value(msg: str) -> int:
-    match = re.search(r"LOOP\[\s*(\d+)", msg)
+    match = _LOOP_RE.search(msg)
     if not match:
         return 0
     return _to_int(match.group(1), 0)
 
 
+def _extract_workmode(msg: str) -> int:
+    match = _WORKMODE_RE.search(msg)
+    return _to_int(match.group(1), 0) if match else 0
+
+
+def _extract_worklevel(msg: str) -> int:
+    match = _WORKLEVEL_RE.search(msg)
+    return _to_int(match.group(1), 0) if match else 0
+
+
 def _extract_work_mode_level(msg: str) -> Tuple[int, int]:
-    mode_match = re.search(r"workmode\s+(\d+)", msg)
-    level_match = re.search(r"worklevel\s+(\d+)", msg)
-    return _to_int(mode_match.group(1), 0) if mode_match else 0, _to_int(level_match.group(1), 0) if level_match else 0
+    return _extract_workmode(msg), _extract_worklevel(msg)
+
+
+# Divisors from the unit prefix of a summary/devs hashrate key to TH/s
+_HASHRATE_DIVISORS = {"MHS": 1_000_000, "GHS": 1_000, "KHS": 1_000_000_000}
+_AVG_HASHRATE_KEYS = ("MHS av", "GHS av", "KHS av")
+_WINDOW_HASHRATE_KEYS = ("MHS 5s", "MHS 1m", "MHS 5m", "MHS 15m", "GHS 5s", "GHS 1m", "GHS 5m", "GHS 15m")
 
 
 def _hashrate_to_th(entry: Dict, key: str) -> float:
-    value = _to_float(entry.get(key), 0.0)
-    if key.startswith("MHS"):
-        return value / 1_000_000
-    if key.startswith("GHS"):
-        return value / 1_000
-    if key.startswith("KHS"):
-        return value / 1_000_000_000
-    return 0.0
+    divisor = _HASHRATE_DIVISORS.get(key[:3])
+    if divisor is None:
+        return 0.0
+    return _to_float(entry.get(key), 0.0) / divisor
 
 
-def _extract_hashrate_th(entry: Dict, keys: List[str]) -> float:
+def _extract_hashrate_th(entry: Dict, keys: Tuple[str, ...]) -> float:
     for key in keys:
         if key in entry:
             return _hashrate_to_th(entry, key)
@@ -102,18 +191,20 @@ def _extract_hashrate_th(entry: Dict, keys: List[str]) -> float:
 
 def _normalize_product_text(prod: Optional[str]) -> str:
     text = (prod or "").lower()
-    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+    return _NON_ALNUM_RE.sub(" ", text).strip()
 
 
+@lru_cache(maxsize=64)
 def device_key_from_product(prod: Optional[str]) -> str:
     text = _normalize_product_text(prod)
     if "nano3" in text:
         return "nano3s"
     if "mini3" in text:
         return "mini3"
-    if "avalonq" in text or re.search(r"\bavalon\s*q\b", text):
+    # Substring tests gate the regexes: "avalon q" needs "avalon" in the text.
+    if "avalonq" in text or ("avalon" in text and _AVALON_Q_RE.search(text)):
         return "q"
-    if re.search(r"\bq\b", text) and ("avalon" in text or "canaan" in text or "miner" in text or text == "q"):
+    if (text == "q" or "avalon" in text or "canaan" in text or "miner" in text) and _Q_WORD_RE.search(text):
         return "q"
     return "unknown"
 
@@ -130,18 +221,31 @@ def device_short_name(prod: Optional[str]) -> str:
 
 def parse_mm_id0(mm: str, temp_keys: Optional[List[str]] = None) -> Dict:
     """Parse MM ID0 stats payload into normalized metrics."""
-    def get(pattern, default="0"):
-        m = re.search(pattern, mm)
-        return m.group(1) if m else default
+    fields = _mm_fields(mm)
+    get_field = fields.get
 
-    def get_field(key: str) -> Optional[str]:
-        match = re.search(re.escape(key) + r"\[([^\]]+)\]", mm)
-        return match.group(1) if match else None
+    def get(key, default="0"):
+        value = fields.get(key)
+        if value is None:
+            return default
+        # Plain ASCII digits satisfy every pattern in _MM_VALUE_RES as-is.
+        if value.isdigit() and value.isascii():
+            return value
+        m = _MM_VALUE_RES[key].fullmatch(value)
+        return m.group(1) if m else default
 
     def parse_number(text: Optional[str], default: Optional[float] = None) -> Optional[float]:
         if text is None:
             return default
-        m = re.search(r"-?\d+(?:\.\d+)?", text)
+        if text.isdigit() and text.isascii():
+            return int(text)
+        # Other plain "[-]digits[.digits][%]" values convert directly; only
+        # text with anything else around the number needs the regex.
+        body = text[:-1] if text.endswith("%") else text
+        whole, dot, frac = (body[1:] if body.startswith("-") else body).partition(".")
+        if body.isascii() and whole.isdigit() and (frac.isdigit() or not dot):
+            return float(body)
+        m = _NUMBER_RE.search(text)
         return float(m.group(0)) if m else default
 
     def parse_int(text: Optional[str], default: int = 0) -> int:
@@ -151,28 +255,29 @@ def parse_mm_id0(mm: str, temp_keys: Optional[List[str]] = None) -> Dict:
         return int(value)
 
     def select_temp(keys: List[str]) -> int:
-        for key in keys:
-            value = parse_number(get_field(key), None)
-            if value is None:
-                continue
-            if -40 <= value <= 200:
-                return int(value)
-        return 0
+        """First plausible reading among keys, in order; later keys are not parsed."""
+        values = (parse_number(get_field(key), None) for key in keys)
+        return next((int(value) for value in values if value is not None and -40 <= value <= 200), 0)
 
     power_in, power_out = 0, 0
     ps = get_field("PS")
     if ps:
-        parts = [int(p) for p in re.findall(r"-?\d+", ps)]
+        # PS is normally space-separated non-negative integers; split those
+        # directly and leave anything unusual to the integer regex.
+        if ps.isascii() and ps.replace(" ", "").isdigit():
+            parts = ps.split()
+        else:
+            parts = _INT_RE.findall(ps)
         if len(parts) > 4:
-            power_in, power_out = parts[1], parts[4]
+            power_in, power_out = int(parts[1]), int(parts[4])
 
     # Get SF0 base frequency (actual set value) - SF0[600 618 639 660]
     freq = 0
     sf0 = get_field("SF0")
     if sf0:
-        parts = sf0.split()
+        parts = sf0.split(None, 1)
         if parts:
-            freq = int(float(parts[0]))
+            freq = _int_text(parts[0])
     if not freq:
         freq = parse_int(get_field("Freq"), 0)
 
@@ -182,11 +287,12 @@ def parse_mm_id0(mm: str, temp_keys: Optional[List[str]] = None) -> Dict:
     ata_power = 0
     ata = get_field("ATA1")
     if ata:
-        parts = ata.split('-')
+        # Only the first three fields are read; leave the rest unsplit.
+        parts = ata.split('-', 3)
         if len(parts) >= 3:
             try:
-                ata_power = int(float(parts[0]))
-                voltage = int(float(parts[2]))
+                ata_power = _int_text(parts[0])
+                voltage = _int_text(parts[2])
             except ValueError:
                 pass
 
@@ -196,14 +302,14 @@ def parse_mm_id0(mm: str, temp_keys: Optional[List[str]] = None) -> Dict:
 
     temp = select_temp(temp_keys or DEFAULT_TEMP_KEYS)
     temp_max = select_temp(["TMax", "MTmax"])
-    worklevel = parse_int(get(r'WORKLVL\[(\d+)\]', None), 0)
+    worklevel = parse_int(get("WORKLVL", None), 0)
     if worklevel == 0:
-        worklevel = parse_int(get(r'WORKLEVEL\[(\d+)\]', None), 0)
+        worklevel = parse_int(get("WORKLEVEL", None), 0)
 
     return {
-        "hashrate": float(get(r'GHSavg\[([0-9.]+)\]')) / 1000,
-        "hashrate_max": float(get(r'GHSmm\[([0-9.]+)\]')) / 1000,
-        "uptime": int(get(r'Elapsed\[(\d+)\]')),
+        "hashrate": float(get("GHSavg")) / 1000,
+        "hashrate_max": float(get("GHSmm")) / 1000,
+        "uptime": int(get("Elapsed")),
         "temp": temp,
         "temp_max": temp_max,
         "fan_rpm": parse_int(get_field("Fan1"), 0),
@@ -212,50 +318,176 @@ def parse_mm_id0(mm: str, temp_keys: Optional[List[str]] = None) -> Dict:
         "voltage": voltage,
         "power_in": power_in,
         "power_out": power_out,
-        "workmode": int(get(r'WORKMODE\[(\d+)\]', "1")),
+        "workmode": int(get("WORKMODE", "1")),
         "worklevel": worklevel,
-        "hw_errors": int(get(r'HW\[(\d+)\]')),
-        "dh_rate": float(get(r'DH\[([0-9.]+)%?\]', "0")),
-        "dna": get(r'DNA\[([0-9a-fA-F]+)\]', '').lower(),
+        "hw_errors": int(get("HW")),
+        "dh_rate": float(get("DH", "0")),
+        "dna": get("DNA", '').lower(),
     }
 
 
+# (host, port) -> IPv4 socket address, shared by every Miner and fleet_cmd.
+# An entry is dropped when connecting to it fails, so a miner that moved
+# (DHCP lease, DNS change) is looked up again on the next attempt.
+_ADDR_CACHE: Dict[Tuple[str, int], Tuple[str, int]] = {}
+
+
+def _is_ipv4_literal(host: str) -> bool:
+    try:
+        socket.inet_pton(socket.AF_INET, host)
+    except OSError:
+        return False
+    return True
+
+
+def _resolve(host: str, port: int) -> Tuple[str, int]:
+    """Resolve host:port to an IPv4 socket address, once per process; raises OSError."""
+    key = (host, port)
+    address = _ADDR_CACHE.get(key)
+    if address is None:
+        if _is_ipv4_literal(host):
+            address = (host, port)
+        else:
+            address = socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_STREAM)[0][4]
+        _ADDR_CACHE[key] = address
+    return address
+
+
+def _forget_address(host: str, port: int) -> None:
+    _ADDR_CACHE.pop((host, port), None)
+
+
+def resolve_hosts(hosts: List[str], port: int,
+                  timeout: Optional[float] = None) -> Dict[str, Optional[Tuple[str, int]]]:
+    """Resolve many hosts, looking up names concurrently; unresolvable hosts map to None.
+
+    With a timeout, names still being looked up after that many seconds also
+    map to None.
+    """
+    def resolve(host):
+        try:
+            return _resolve(host, port)
+        except OSError:
+            return None
+
+    pending = [
+        host for host in dict.fromkeys(hosts)
+        if (host, port) not in _ADDR_CACHE and not _is_ipv4_literal(host)
+    ]
+    resolved = {}
+    if len(pending) > 1 or (pending and timeout is not None):
+        # getaddrinfo releases the GIL, so lookups for a large fleet overlap.
+        # A lookup that outlives the timeout is left to finish on its own.
+        executor = ThreadPoolExecutor(max_workers=min(32, len(pending)))
+        futures = {host: executor.submit(resolve, host) for host in pending}
+        done, _ = wait(futures.values(), timeout)
+        executor.shutdown(wait=False)
+        resolved = {host: future.result() if future in done else None for host, future in futures.items()}
+    return {host: resolved[host] if host in resolved else resolve(host) for host in hosts}
+
+
+# Worker threads for concurrent read-only probes, created on first use and
+# kept, so repeated polls (do_watch) don't start new threads every sample.
+_PROBE_POOL: Optional[ThreadPoolExecutor] = None
+_PROBE_POOL_LOCK = threading.Lock()
+
+
+def _probe_pool() -> ThreadPoolExecutor:
+    global _PROBE_POOL
+    with _PROBE_POOL_LOCK:
+        if _PROBE_POOL is None:
+            _PROBE_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="probe")
+    return _PROBE_POOL
+
+
+@lru_cache(maxsize=128)
+def _encode_request(command: str, param: Optional[str] = None) -> bytes:
+    """JSON request bytes; report commands repeat verbatim, so encode each once."""
+    payload = {"command": command}
+    if param:
+        payload["parameter"] = param
+    return json.dumps(payload).encode()
+
+
+def parse_stats_data(stats: Optional[Dict], device_key: Optional[str] = None) -> Optional[Dict]:
+    """Parse the MM ID0 payload of a stats reply; None if the reply has none."""
+    for stat in (stats or {}).get("STATS") or []:
+        if "MM ID0" in stat:
+            temp_keys = DEVICE_TEMP_KEYS.get(device_key, DEFAULT_TEMP_KEYS)
+            return parse_mm_id0(stat["MM ID0"], temp_keys=temp_keys)
+    return None
+
+
 class Miner:
     """CGMiner API client."""
 
-    def __init__(self, host: str, port: int = 4028, timeout: int = 10):
+    def __init__(self, host: str, port: int = 4028, timeout: float = 10):
         self.host = host
         self.port = port
         self.timeout = timeout
         self._dna = None
+        self._auth_cache: Dict[Tuple[bytes, str], Dict[str, str]] = {}
+
+    def _address(self) -> Tuple:
+        """Resolved host:port; CGMiner closes the socket after every reply,
+        so each command still needs its own connection, but not its own lookup."""
+        return _resolve(self.host, self.port)
 
     def cmd(self, command: str, param: str = None) -> Optional[Dict]:
-        """Send command to CGMiner API."""
-        sock = None
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(self.timeout)
-            sock.connect((self.host, self.port))
+        """Send command to CGMiner API.
 
-            payload = {"command": command}
-            if param:
-                payload["parameter"] = param
+        ``timeout`` bounds the whole request, so a host that trickles its
+        reply cannot hold the caller much longer than that.
+        """
+        sock = None
+        deadline = time.monotonic() + self.timeout
 
-            sock.send(json.dumps(payload).encode())
+        def time_left() -> float:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise socket.timeout("timed out")
+            return left
 
-            response = b""
+        try:
+            address = self._address()
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(time_left())
+            # One small request per connection: don't let Nagle hold it back.
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            try:
+                sock.connect(address)
+            except OSError:
+                _forget_address(self.host, self.port)
+                raise
+
+            sock.settimeout(time_left())
+            sock.sendall(_encode_request(command, param))
+
+            # Receive straight into one growing buffer; the NUL terminator can
+            # only be in the newest bytes, so only those are scanned.
+            buf = bytearray(16384)
+            size, end = 0, -1
             while True:
+                if size == len(buf):
+                    buf.extend(bytes(len(buf)))
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                sock.settimeout(remaining)
                 try:
-                    chunk = sock.recv(4096)
-                    if not chunk:
-                        break
-                    response += chunk
-                    if b'\x00' in response:
-                        break
+                    with memoryview(buf) as view:
+                        n = sock.recv_into(view[size:])
                 except socket.timeout:
                     break
+                if not n:
+                    break
+                size += n
+                end = buf.find(b'\x00', size - n, size)
+                if end != -1:
+                    break
 
-            return json.loads(response.rstrip(b'\x00').decode())
+            # The JSON decoders take the bytearray slice as-is: one copy, no str.
+            return _loads_reply(buf[:size if end == -1 else end])
 
         except ConnectionRefusedError:
             print(f"error: connection refused ({self.host}:{self.port})", file=sys.stderr)
@@ -271,6 +503,122 @@ class Miner:
                     pass
         return None
 
+    def cmd_multi(self, *commands: str) -> List[Optional[Dict]]:
+        """Send parameterless report commands in one request ("version+stats").
+
+        Returns one response per command, in order, each shaped like a single
+        cmd() reply. Falls back to one request per command if the reply is not
+        a multi-command response; if the miner is unreachable, every entry is None.
+        """
+        if len(commands) < 2:
+            return [self.cmd(command) for command in commands]
+        reply = self.cmd("+".join(commands))
+        if reply is None:
+            return [None] * len(commands)
+        return _split_multi_reply(reply, commands) or [self.cmd(command) for command in commands]
+
+    @classmethod
+    def fleet_cmd(cls, hosts: List[str], port: int = 4028, command: str = "version",
+                  param: str = None, timeout: float = 10, limit: int = 10,
+                  on_reply=None) -> Dict[str, Optional[Dict]]:
+        """Send one command to many miners from a single thread.
+
+        Uses non-blocking sockets and a selector, keeping up to ``limit``
+        requests in flight and starting the next one as each finishes. As with
+        cmd(), each host gets ``timeout`` seconds; name lookups are bounded by
+        the same timeout. Returns {host: reply}; unresolvable or unreachable
+        hosts, bad replies and hosts that time out map to None. Running out of
+        local sockets raises OSError instead of marking hosts unreachable.
+
+        ``on_reply(host, reply)``, if given, is called from this thread as each
+        host's result is settled, so callers can act on it before the rest of
+        the fleet is done.
+        """
+        request = _encode_request(command, param)
+        results: Dict[str, Optional[Dict]] = {host: None for host in hosts}
+        addresses = resolve_hosts(list(results), port, timeout)
+        queue = deque(host for host in results if addresses[host])
+        unsent: Dict[str, memoryview] = {}
+        buffers: Dict[str, bytearray] = {}
+        sel = selectors.DefaultSelector()
+
+        def report(host, reply):
+            results[host] = reply
+            if on_reply:
+                on_reply(host, reply)
+
+        def failed(host):
+            if host not in buffers:  # never got as far as reading a reply
+                _forget_address(host, port)
+            report(host, None)
+
+        def start():
+            while queue and len(sel.get_map()) < limit:
+                try:
+                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                except OSError as e:
+                    # Out of descriptors is a local limit, not a dead miner:
+                    # wait for a request in flight to free one.
+                    if e.errno in (errno.EMFILE, errno.ENFILE) and sel.get_map():
+                        return
+                    raise
+                host = queue.popleft()
+                sock.setblocking(False)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.connect_ex(addresses[host])
+                unsent[host] = memoryview(request)
+                sel.register(sock, selectors.EVENT_WRITE, (host, time.monotonic() + timeout))
+
+        def finish(sock):
+            sel.unregister(sock)
+            sock.close()
+
+        try:
+            for host in results:
+                if not addresses[host]:
+                    report(host, None)
+            start()
+            while sel.get_map():
+                now = time.monotonic()
+                for key in list(sel.get_map().values()):
+                    if key.data[1] <= now:
+                        finish(key.fileobj)
+                        failed(key.data[0])
+                if not sel.get_map():
+                    start()
+                    continue
+                remaining = min(key.data[1] for key in sel.get_map().values()) - now
+                for key, events in sel.select(remaining):
+                    sock, (host, _) = key.fileobj, key.data
+                    try:
+                        if events & selectors.EVENT_WRITE:
+                            error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                            if error:
+                                raise OSError(error, os.strerror(error))
+                            # A short write leaves the tail for the next EVENT_WRITE.
+                            unsent[host] = unsent[host][sock.send(unsent[host]):]
+                            if unsent[host]:
+                                continue
+                            buffers[host] = bytearray()
+                            sel.modify(sock, selectors.EVENT_READ, key.data)
+                            continue
+                        chunk = sock.recv(4096)
+                        buffers[host] += chunk
+                        if chunk and b'\x00' not in chunk:
+                            continue
+                        finish(sock)
+                        report(host, _loads_reply(buffers[host].rstrip(b'\x00')))
+                    except (OSError, ValueError):
+                        if sock.fileno() != -1:
+                            finish(sock)
+                        failed(host)
+                start()
+        finally:
+            for key in list(sel.get_map().values()):
+                key.fileobj.close()
+            sel.close()
+        return results
+
     def ascset(self, param: str) -> Optional[Dict]:
         return self.cmd("ascset", param)
 
@@ -284,7 +632,7 @@ class Miner:
             mm_payload = stat.get("MM ID0")
             if not mm_payload:
                 continue
-            match = re.search(r'DNA\[([0-9a-fA-F]+)\]', mm_payload)
+            match = _DNA_RE.search(mm_payload)
             if match:
                 self._dna = match.group(1).lower()
                 return self._dna
@@ -299,41 +647,47 @@ class Miner:
 
     def _parse_fallback_stats(self, version_entry: Optional[Dict] = None) -> Dict:
         """Build metrics from summary/devs + ascset info when MM ID0 is unavailable."""
-        summary_resp = self.cmd("summary")
-        devs_resp = self.cmd("devs")
+        # summary, devs and (if needed) version go out as one multi-command.
+        # version_entry=None means "not fetched"; an empty entry is still an answer.
+        commands = ("summary", "devs") if version_entry is not None else ("summary", "devs", "version")
+        summary_resp, devs_resp, *ver = self.cmd_multi(*commands)
         summary = summary_resp.get("SUMMARY", [{}])[0] if summary_resp and "SUMMARY" in summary_resp else {}
         dev = devs_resp.get("DEVS", [{}])[0] if devs_resp and "DEVS" in devs_resp else {}
         if not summary and not dev:
             return {}
 
-        hashrate = _extract_hashrate_th(summary, ["MHS av", "GHS av", "KHS av"])
+        # The ascset queries take parameters and cannot join a multi-command,
+        # but they are independent of each other, so they run side by side.
+        pool = _probe_pool()
+        probes = [pool.submit(self.ascset, param) for param in ("0,voltage", "0,work_mode_lvl,get", "0,loop,get")]
+        ps_msg, work_msg, loop_msg = (_status_msg(probe.result()) for probe in probes)
+
+        hashrate = _extract_hashrate_th(summary, _AVG_HASHRATE_KEYS)
         if not hashrate:
-            hashrate = _extract_hashrate_th(dev, ["MHS av", "GHS av", "KHS av"])
+            hashrate = _extract_hashrate_th(dev, _AVG_HASHRATE_KEYS)
 
         hashrate_max = hashrate
-        for key in ["MHS 5s", "MHS 1m", "MHS 5m", "MHS 15m", "GHS 5s", "GHS 1m", "GHS 5m", "GHS 15m"]:
+        for key in _WINDOW_HASHRATE_KEYS:
             if key in summary:
                 hashrate_max = max(hashrate_max, _hashrate_to_th(summary, key))
             if key in dev:
                 hashrate_max = max(hashrate_max, _hashrate_to_th(dev, key))
 
         power_in = power_out = voltage = 0
-        ps_msg = _status_msg(self.ascset("0,voltage"))
         if "PS[" in ps_msg:
             power_in, voltage, power_out = _extract_ps_values(ps_msg)
 
         workmode = worklevel = 0
-        work_msg = _status_msg(self.ascset("0,work_mode_lvl,get"))
         if "workmode" in work_msg and "worklevel" in work_msg:
             workmode, worklevel = _extract_work_mode_level(work_msg)
         else:
-            workmode = _extract_work_mode_level(_status_msg(self.ascset("0,workmode,get")))[0]
-            worklevel = _extract_work_mode_level(_status_msg(self.ascset("0,worklevel,get")))[1]
+            workmode = _extract_workmode(_status_msg(self.ascset("0,workmode,get")))
+            worklevel = _extract_worklevel(_status_msg(self.ascset("0,worklevel,get")))
 
-        freq = _extract_loop_value(_status_msg(self.ascset("0,loop,get")))
+        freq = _extract_loop_value(loop_msg)
 
-        if not version_entry:
-            ver = self.cmd("version")
+        if version_entry is None:
+            ver = ver[0] if ver else None
             if ver and "VERSION" in ver and ver["VERSION"]:
                 version_entry = ver["VERSION"][0]
             else:
@@ -358,42 +712,52 @@ class Miner:
             "dna": (version_entry.get("DNA", "") or "").lower(),
         }
 
-    def parse_stats(self, device_key: Optional[str] = None, version_entry: Optional[Dict] = None) -> Dict:
-        """Extract metrics from stats response."""
-        stats = self.cmd("stats")
-        if not stats or "STATS" not in stats:
-            if device_key == "q":
-                return self._parse_fallback_stats(version_entry=version_entry)
-            return {}
-
-        for stat in stats["STATS"]:
-            if "MM ID0" not in stat:
-                continue
-            temp_keys = DEVICE_TEMP_KEYS.get(device_key, DEFAULT_TEMP_KEYS)
-            return parse_mm_id0(stat["MM ID0"], temp_keys=temp_keys)
+    def parse_stats(self, device_key: Optional[str] = None, version_entry: Optional[Dict] = None,
+                    stats: Optional[Dict] = None) -> Dict:
+        """Extract metrics from stats response.
 
+        Pass an already-fetched ``stats`` reply to skip the request. A parsed
+        DNA is kept for get_dna(), saving it a stats request.
+        """
+        if stats is None:
+            stats = self.fetch_stats()
+        parsed = parse_stats_data(stats, device_key)
         # Avalon Q and some newer firmwares may omit MM ID0 and expose metrics via summary/devs.
-        if device_key == "q":
-            return self._parse_fallback_stats(version_entry=version_entry)
-        return {}
+        if parsed is None:
+            parsed = self._parse_fallback_stats(version_entry=version_entry) if device_key == "q" else {}
+        if parsed.get("dna") and not self._dna:
+            self._dna = parsed["dna"]
+        return parsed
+
+    def fetch_stats(self) -> Optional[Dict]:
+        return self.cmd("stats")
 
     def compute_auth(self, password: str) -> Dict[str, str]:
-        """Compute web auth credentials."""
+        """Compute web auth credentials.
+
+        Results are cached per (password hash, DNA), so the plaintext
+        password is never kept.
+        """
         dna = self.get_dna()
         if not dna:
             raise ValueError("Could not get DNA from device")
 
-        webpass = hashlib.sha256(password.encode()).hexdigest()
-        code = hashlib.sha256(dna.encode()).hexdigest()[:24]
-        auth = hashlib.sha256((webpass[:8] + dna).encode()).hexdigest()[:8]
-        verify = "ff0000ee" + hashlib.sha256((code + webpass[:24]).encode()).hexdigest()[:24]
-
-        return {
-            "dna": dna,
-            "auth": auth,
-            "verify": verify,
-            "cookie": auth + webpass[:24],
-        }
+        pass_digest = hashlib.sha256(password.encode()).digest()
+        creds = self._auth_cache.get((pass_digest, dna))
+        if creds is None:
+            # Only hex prefixes are used, so hex-encode just the bytes needed
+            # (12 bytes = 24 hex chars, 4 bytes = 8).
+            webpass = pass_digest[:12].hex()
+            code = hashlib.sha256(dna.encode()).digest()[:12].hex()
+            auth = hashlib.sha256((webpass[:8] + dna).encode()).digest()[:4].hex()
+            verify = "ff0000ee" + hashlib.sha256((code + webpass).encode()).digest()[:12].hex()
+            creds = self._auth_cache[(pass_digest, dna)] = {
+                "dna": dna,
+                "auth": auth,
+                "verify": verify,
+                "cookie": auth + webpass,
+            }
+        return dict(creds)
 
     def web_auth(self, password: str) -> Optional[str]:
         """Authenticate and return session cookie."""
@@ -401,20 +765,37 @@ class Miner:
         self.ascset(f"0,qr_auth,{creds['auth']},{creds['verify']}")
         try:
             resp = urllib.request.urlopen(f"http://{self.host}/is_login.cgi", timeout=5).read().decode()
-            match = re.search(r'"auth"\s*:\s*"([^"]+)"\s*,\s*"code"\s*:\s*"([^"]+)"', resp)
-            if match:
-                return match.group(1) + match.group(2)
+            # Look the two keys up separately so neither their order nor the
+            # separator between them matters.
+            auth_match = _AUTH_RE.search(resp)
+            code_match = _CODE_RE.search(resp)
+            if auth_match and code_match:
+                return auth_match.group(1) + code_match.group(1)
         except (urllib.error.URLError, socket.timeout):
             pass
         return creds['cookie']
 
 
+FLEET_STATUS_COMMANDS = ("version", "stats")
+
+
+def positive_float(value: str) -> float:
+    """argparse type for durations that must be greater than zero."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}")
+    if not 0 < number < float("inf"):
+        raise argparse.ArgumentTypeError(f"must be a finite number greater than 0: {value!r}")
+    return number
+
+
 def parse_hosts(host_arg: str) -> List[str]:
     """Parse hosts from comma-separated list or file."""
     if os.path.isfile(host_arg):
         try:
             with open(host_arg, encoding='utf-8') as f:
-                return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+                return [host for line in f.read().splitlines() if (host := line.strip()) and not host.startswith('#')]
         except (IOError, UnicodeDecodeError) as e:
             print(f"error: cannot read hosts file: {e}", file=sys.stderr)
             sys.exit(1)
@@ -455,7 +836,7 @@ def check_result(result: Optional[Dict], ok_msg: str) -> bool:
 # Commands
 
 def do_status(m: Miner, args, compact: bool = False):
-    ver = m.cmd("version")
+    ver, stats_reply = m.cmd_multi("version", "stats")
     if not ver or "VERSION" not in ver:
         if compact:
             print(f"{m.host:<16} OFFLINE")
@@ -465,7 +846,7 @@ def do_status(m: Miner, args, compact: bool = False):
     ver = ver["VERSION"][0]
     prod = ver.get("PROD") or ver.get("MODEL") or ver.get("Model")
     device_key = device_key_from_product(prod)
-    stats = m.parse_stats(device_key, version_entry=ver)
+    stats = m.parse_stats(device_key, version_entry=ver, stats=stats_reply)
 
     if compact:
         # Single-line output for fleet view
@@ -477,25 +858,32 @@ def do_status(m: Miner, args, compact: bool = False):
             print(f"{m.host:<16} CONNECTED (no stats)")
         return
 
-    print(f"\n  {ver.get('PROD', 'Avalon Miner')} @ {m.host}")
-    print(f"  DNA: {ver.get('DNA', 'N/A')}  MAC: {ver.get('MAC', 'N/A')}")
-    print(f"  FW: {ver.get('LVERSION', 'N/A')}  CGMiner: {ver.get('CGMiner', 'N/A')}")
+    # Build the report and write it in one go rather than a print per line.
+    lines = [
+        "",
+        f"  {ver.get('PROD', 'Avalon Miner')} @ {m.host}",
+        f"  DNA: {ver.get('DNA', 'N/A')}  MAC: {ver.get('MAC', 'N/A')}",
+        f"  FW: {ver.get('LVERSION', 'N/A')}  CGMiner: {ver.get('CGMiner', 'N/A')}",
+    ]
 
     if stats:
         efficiency = None
         if stats['hashrate'] > 0 and stats['power_in'] > 0:
             efficiency = stats['power_in'] / stats['hashrate']
-        print()
-        print(f"  Hashrate   {stats['hashrate']:.2f} TH/s (max {stats['hashrate_max']:.2f})")
-        print(f"  Errors     {stats['dh_rate']:.1f}% reject, {stats['hw_errors']} HW")
-        print(f"  Temp       {stats['temp']}C (max {stats['temp_max']}C)")
-        print(f"  Fan        {stats['fan_rpm']} RPM ({stats['fan_pct']}%)")
         eff_str = f"{efficiency:.1f} J/TH" if efficiency is not None else "N/A"
-        print(f"  Power      {stats['power_in']}W in, {stats['power_out']}W out ({eff_str})")
-        print(f"  Freq       {stats['freq']:.0f} MHz @ {stats['voltage']} mV")
-        print(f"  Mode       {MODE_NAMES.get(stats['workmode'], '?')} (level {stats['worklevel']})")
-        print(f"  Uptime     {fmt_uptime(stats['uptime'])}")
-    print()
+        lines += [
+            "",
+            f"  Hashrate   {stats['hashrate']:.2f} TH/s (max {stats['hashrate_max']:.2f})",
+            f"  Errors     {stats['dh_rate']:.1f}% reject, {stats['hw_errors']} HW",
+            f"  Temp       {stats['temp']}C (max {stats['temp_max']}C)",
+            f"  Fan        {stats['fan_rpm']} RPM ({stats['fan_pct']}%)",
+            f"  Power      {stats['power_in']}W in, {stats['power_out']}W out ({eff_str})",
+            f"  Freq       {stats['freq']:.0f} MHz @ {stats['voltage']} mV",
+            f"  Mode       {MODE_NAMES.get(stats['workmode'], '?')} (level {stats['worklevel']})",
+            f"  Uptime     {fmt_uptime(stats['uptime'])}",
+        ]
+    lines.append("")
+    print("\n".join(lines))
 
 
 def do_pools(m: Miner, args):
@@ -514,17 +902,27 @@ def do_pools(m: Miner, args):
 
 
 def do_watch(m: Miner, args):
-    ver = m.cmd("version")
+    ver, stats_reply = m.cmd_multi("version", "stats")
     prod = None
     version_entry = None
     if ver and "VERSION" in ver and ver["VERSION"]:
         version_entry = ver["VERSION"][0]
         prod = version_entry.get("PROD") or version_entry.get("MODEL") or version_entry.get("Model")
     device_key = device_key_from_product(prod)
+    # CGMiner drops the connection after each reply, so what can be saved per
+    # poll is requests: a Q whose stats carry no MM ID0 is polled through the
+    # summary/devs fallback alone instead of fetching stats first every time.
+    fallback_only = (device_key == "q" and stats_reply is not None
+                     and parse_stats_data(stats_reply, device_key) is None)
     print(f"Monitoring {m.host} (Ctrl+C to stop)\n")
     try:
         while True:
-            stats = m.parse_stats(device_key, version_entry=version_entry)
+            if fallback_only:
+                stats = m._parse_fallback_stats(version_entry=version_entry)
+            else:
+                # The first sample reuses the stats fetched alongside version.
+                stats = m.parse_stats(device_key, version_entry=version_entry, stats=stats_reply)
+                stats_reply = None
             if stats:
                 timestamp = time.strftime("%H:%M:%S")
                 mode = MODE_ABBREV.get(stats['workmode'], '?')
@@ -540,33 +938,54 @@ def do_reboot(m: Miner, args):
     check_result(m.ascset("0,reboot,1"), "rebooting")
 
 
+# Single-ascset setters: name -> (ascset parameter, success message) templates.
+# Frequency format: pll0:pll1:pll2:pll3 (all 4 PLLs set to the same value).
+ASCSET_SETTERS = {
+    "fan": ("0,fan-spd,{speed}", "fan set to {speed}%"),
+    "fan-auto": ("0,fan-spd,-1", "fan set to auto"),
+    "freq": ("0,frequency,{freq}:{freq}:{freq}:{freq}", "frequency set to {freq} MHz"),
+    "mode": ("0,workmode,set,{mode}", "mode set to {mode_name}"),
+    "level": ("0,worklevel,set,{level}", "level set to {level}"),
+    "work-mode-level": ("0,work_mode_lvl,set,{mode},{level}", "mode set to {mode_name} (level {level})"),
+    "voltage": ("0,voltage,{mv}", "voltage set to {mv} mV"),
+    "solo": ("0,solo-allowed,{value}", "solo-allowed set to {value}"),
+}
+
+SOLO_VALUES = {"1": 1, "on": 1, "true": 1, "yes": 1, "0": 0, "off": 0, "false": 0, "no": 0}
+
+
+def _run_setter(m: Miner, name: str, **values) -> bool:
+    param, msg = ASCSET_SETTERS[name]
+    return check_result(m.ascset(param.format(**values)), msg.format(**values))
+
+
 def do_fan(m: Miner, args):
-    speed = -1 if args.speed == "auto" else int(args.speed)
-    if speed != -1 and not 15 <= speed <= 100:
+    # -1 is the firmware's own value for auto, so it is accepted as an alias.
+    if args.speed in ("auto", "-1"):
+        _run_setter(m, "fan-auto")
+        return
+    speed = int(args.speed)
+    if not 15 <= speed <= 100:
         print_err("fan speed must be 15-100 or 'auto'")
         return
-    msg = "fan set to auto" if speed == -1 else f"fan set to {speed}%"
-    check_result(m.ascset(f"0,fan-spd,{speed}"), msg)
+    _run_setter(m, "fan", speed=speed)
 
 
 def do_freq(m: Miner, args):
-    # Frequency format: pll0:pll1:pll2:pll3 (set all 4 PLLs to same value)
-    f = args.freq
-    check_result(m.ascset(f"0,frequency,{f}:{f}:{f}:{f}"), f"frequency set to {f} MHz")
+    _run_setter(m, "freq", freq=args.freq)
 
 
 def do_mode(m: Miner, args):
-    check_result(m.ascset(f"0,workmode,set,{args.mode}"), f"mode set to {MODE_NAMES.get(args.mode, args.mode)}")
+    _run_setter(m, "mode", mode=args.mode, mode_name=MODE_NAMES.get(args.mode, args.mode))
 
 
 def do_level(m: Miner, args):
-    check_result(m.ascset(f"0,worklevel,set,{args.level}"), f"level set to {args.level}")
+    _run_setter(m, "level", level=args.level)
 
 
 def do_work_mode_level(m: Miner, args):
-    check_result(
-        m.ascset(f"0,work_mode_lvl,set,{args.mode},{args.level}"),
-        f"mode set to {MODE_NAMES.get(args.mode, args.mode)} (level {args.level})",
+    _run_setter(
+        m, "work-mode-level", mode=args.mode, level=args.level, mode_name=MODE_NAMES.get(args.mode, args.mode)
     )
 
 
@@ -574,19 +993,15 @@ def do_voltage(m: Miner, args):
     if not 2150 <= args.mv <= 2600:
         print_err("voltage must be in range 2150-2600 mV")
         return
-    check_result(m.ascset(f"0,voltage,{args.mv}"), f"voltage set to {args.mv} mV")
+    _run_setter(m, "voltage", mv=args.mv)
 
 
 def do_solo_allowed(m: Miner, args):
-    value_text = str(args.enabled).strip().lower()
-    if value_text in {"1", "on", "true", "yes"}:
-        value = 1
-    elif value_text in {"0", "off", "false", "no"}:
-        value = 0
-    else:
+    value = SOLO_VALUES.get(str(args.enabled).strip().lower())
+    if value is None:
         print_err("solo must be 0/1 (or off/on)")
         return
-    check_result(m.ascset(f"0,solo-allowed,{value}"), f"solo-allowed set to {value}")
+    _run_setter(m, "solo", value=value)
 
 
 def do_qinfo(m: Miner, args):
@@ -685,7 +1100,7 @@ def do_auth(m: Miner, args):
 def do_getauth(m: Miner, args):
     try:
         resp = urllib.request.urlopen(f"http://{m.host}/get_auth.cgi", timeout=5).read().decode()
-        match = re.search(r'"auth"\s*:\s*"([^"]+)"', resp)
+        match = _AUTH_RE.search(resp)
         if match:
             print(f"auth: {match.group(1)}")
             dna = m.get_dna()
@@ -730,6 +1145,55 @@ def do_help_ascset(m: Miner, args):
         print_err("failed to get command list")
 
 
+class _ThreadOutput(io.TextIOBase):
+    """Stand-in for sys.stdout/sys.stderr that routes each thread's writes
+    to its own buffer while capturing, and to ``stream`` otherwise.
+
+    redirect_stdout swaps a process-wide attribute, so workers that each
+    use it capture one another's output; this is installed once instead.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        return getattr(self._local, "buffer", self._stream).write(text)
+
+    @contextmanager
+    def capture(self, buffer: io.StringIO):
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            del self._local.buffer
+
+
+def _print_in_order(futures: Dict, on_error, file=None):
+    """Print results in submission order, each as soon as all earlier ones are in.
+
+    ``futures`` maps each future to its position; ``on_error(index, exc)``
+    gives the text for one that raised.
+    """
+    ready: Dict[int, str] = {}
+    next_index = 0
+    for future in as_completed(futures):
+        index = futures[future]
+        try:
+            ready[index] = future.result()
+        except Exception as e:
+            ready[index] = on_error(index, e)
+        batch = []
+        while next_index in ready:
+            batch.append(ready.pop(next_index))
+            next_index += 1
+        if batch:
+            print("\n".join(batch), file=file, flush=True)
+
+
 def main():
     prog = os.path.basename(sys.argv[0]) if sys.argv else 'thermal'
     parser = argparse.ArgumentParser(
@@ -779,53 +1243,70 @@ Fleet management (multiple hosts):
 
     parser.add_argument('-H', '--host', metavar='IP', help='Miner IP(s): single, comma-separated, or file path')
     parser.add_argument('-p', '--port', type=int, default=4028, help='API port (default: 4028)')
+    parser.add_argument('-t', '--timeout', type=positive_float, default=10, metavar='SEC',
+                        help='Per-request timeout in seconds (default: 10)')
     parser.add_argument('-j', '--parallel', type=int, default=10, metavar='N', help='Max parallel connections (default: 10)')
 
     sub = parser.add_subparsers(dest='cmd', metavar='COMMAND')
 
-    sub.add_parser('status', help='Device status')
-    sub.add_parser('pools', help='List pools')
+    sub.add_parser('status', help='Device status').set_defaults(func=do_status)
+    sub.add_parser('pools', help='List pools').set_defaults(func=do_pools)
     w = sub.add_parser('watch', help='Live monitoring')
     w.add_argument('-i', '--interval', type=int, default=5, help='Update interval (default: 5)')
+    w.set_defaults(func=do_watch)
 
-    sub.add_parser('reboot', help='Reboot device')
+    sub.add_parser('reboot', help='Reboot device').set_defaults(func=do_reboot)
     f = sub.add_parser('fan', help='Set fan speed')
     f.add_argument('speed', help="15-100 or 'auto'")
+    f.set_defaults(func=do_fan)
     fr = sub.add_parser('freq', help='Set frequency')
     fr.add_argument('freq', type=int, help='MHz')
+    fr.set_defaults(func=do_freq)
     mo = sub.add_parser('mode', help='Set work mode')
     mo.add_argument('mode', type=int, choices=[0, 1, 2], help='0=Heater, 1=Mining, 2=Night')
+    mo.set_defaults(func=do_mode)
     lv = sub.add_parser('level', help='Set performance level')
     lv.add_argument('level', type=int, help='Level')
+    lv.set_defaults(func=do_level)
     ml = sub.add_parser('work-mode-level', help='Set mode and level together (Avalon Q)')
     ml.add_argument('mode', type=int, choices=[0, 1, 2], help='0=Heater, 1=Mining, 2=Night')
     ml.add_argument('level', type=int, help='Level')
+    ml.set_defaults(func=do_work_mode_level)
     vo = sub.add_parser('voltage', help='Set PSU voltage (Avalon Q)')
     vo.add_argument('mv', type=int, help='2150-2600 mV')
+    vo.set_defaults(func=do_voltage)
     so = sub.add_parser('solo', help='Set solo-allowed (Avalon Q)')
     so.add_argument('enabled', help='0/1 or off/on')
+    so.set_defaults(func=do_solo_allowed)
     lo = sub.add_parser('loop', help='Read or set Avalon Q loop value')
     lo.add_argument('value', nargs='?', type=int, help='Optional loop value')
-    sub.add_parser('timezone', help='Show Avalon Q timezone')
-    sub.add_parser('qinfo', help='Show Avalon Q runtime info')
+    lo.set_defaults(func=do_loop)
+    sub.add_parser('timezone', help='Show Avalon Q timezone').set_defaults(func=do_timezone)
+    sub.add_parser('qinfo', help='Show Avalon Q runtime info').set_defaults(func=do_qinfo)
 
     sp = sub.add_parser('switchpool', help='Switch pool')
     sp.add_argument('id', type=int, help='Pool ID')
+    sp.set_defaults(func=do_switchpool)
     ep = sub.add_parser('enablepool', help='Enable pool')
     ep.add_argument('id', type=int, help='Pool ID')
+    ep.set_defaults(func=do_enablepool)
     dp = sub.add_parser('disablepool', help='Disable pool')
     dp.add_argument('id', type=int, help='Pool ID')
+    dp.set_defaults(func=do_disablepool)
 
     au = sub.add_parser('auth', help='Web authentication')
     au.add_argument('password', help='Device password')
-    sub.add_parser('getauth', help='Get auth hash for recovery')
+    au.set_defaults(func=do_auth)
+    sub.add_parser('getauth', help='Get auth hash for recovery').set_defaults(func=do_getauth)
 
     ra = sub.add_parser('raw', help='Raw CGMiner command')
     ra.add_argument('command', help='Command name')
     ra.add_argument('param', nargs='?', help='Parameter')
+    ra.set_defaults(func=do_raw)
     asc = sub.add_parser('ascset', help='Raw ascset command')
     asc.add_argument('param', help="e.g. '0,fan-spd,80'")
-    sub.add_parser('ascset-help', help='List ascset commands')
+    asc.set_defaults(func=do_ascset)
+    sub.add_parser('ascset-help', help='List ascset commands').set_defaults(func=do_help_ascset)
 
     args = parser.parse_args()
 
@@ -842,39 +1323,10 @@ Fleet management (multiple hosts):
         print("error: no valid hosts specified", file=sys.stderr)
         sys.exit(1)
 
-    cmds = {
-        'status': do_status,
-        'pools': do_pools,
-        'watch': do_watch,
-        'reboot': do_reboot,
-        'fan': do_fan,
-        'freq': do_freq,
-        'mode': do_mode,
-        'level': do_level,
-        'work-mode-level': do_work_mode_level,
-        'voltage': do_voltage,
-        'solo': do_solo_allowed,
-        'loop': do_loop,
-        'timezone': do_timezone,
-        'qinfo': do_qinfo,
-        'switchpool': do_switchpool,
-        'enablepool': do_enablepool,
-        'disablepool': do_disablepool,
-        'auth': do_auth,
-        'getauth': do_getauth,
-        'raw': do_raw,
-        'ascset': do_ascset,
-        'ascset-help': do_help_ascset,
-    }
-
-    if args.cmd not in cmds:
-        parser.print_help()
-        return
-
     # Single host - simple execution
     if len(hosts) == 1:
-        m = Miner(hosts[0], args.port)
-        cmds[args.cmd](m, args)
+        m = Miner(hosts[0], args.port, args.timeout)
+        args.func(m, args)
         return
 
     # Multiple hosts - parallel execution with fleet view
@@ -882,30 +1334,33 @@ Fleet management (multiple hosts):
         print("error: watch command not supported with multiple hosts", file=sys.stderr)
         sys.exit(1)
 
-    def get_fleet_status(host: str) -> str:
-        """Get compact status line for a single host."""
-        m = Miner(host, args.port)
-        ver = m.cmd("version")
+    def get_fleet_status(host: str, reply: Optional[Dict]) -> str:
+        """Get compact status line for a single host from its prefetched version+stats reply."""
+        if reply is None:
+            return f"{host:<16} {'':>8}  OFFLINE"
+        m = Miner(host, args.port, args.timeout)
+        # Firmware without multi-command support: fetch version alone, stats in parse_stats.
+        ver, stats_reply = _split_multi_reply(reply, FLEET_STATUS_COMMANDS) or (m.cmd("version"), None)
         if not ver or "VERSION" not in ver:
             return f"{host:<16} {'':>8}  OFFLINE"
         version_entry = ver["VERSION"][0]
         prod = version_entry.get("PROD") or version_entry.get("MODEL") or version_entry.get("Model")
         dev = device_short_name(prod)
-        stats = m.parse_stats(device_key_from_product(prod), version_entry=version_entry)
+        stats = m.parse_stats(device_key_from_product(prod), version_entry=version_entry, stats=stats_reply)
         if stats:
             mode = MODE_ABBREV.get(stats['workmode'], '?')
             return (f"{host:<16} {dev:>8}  {stats['hashrate']:>6.1f} TH/s  {stats['temp']:>3}C  "
                     f"{stats['fan_pct']:>3}%  {stats['power_in']:>4}W  {mode}  {fmt_uptime(stats['uptime'])}")
         return f"{host:<16} {dev:>8}  CONNECTED (no stats)"
 
+    stdout, stderr = _ThreadOutput(sys.stdout), _ThreadOutput(sys.stderr)
+
     def run_command_on_host(host: str) -> str:
         """Run command on host and capture output."""
-        m = Miner(host, args.port)
-        out = io.StringIO()
-        err = io.StringIO()
+        m = Miner(host, args.port, args.timeout)
         try:
-            with redirect_stdout(out), redirect_stderr(err):
-                cmds[args.cmd](m, args)
+            with stdout.capture(io.StringIO()) as out, stderr.capture(io.StringIO()) as err:
+                args.func(m, args)
         except SystemExit:
             pass  # Ignore sys.exit calls from within commands
         except Exception as e:
@@ -919,35 +1374,56 @@ Fleet management (multiple hosts):
         print(f"\n{'HOST':<16} {'TYPE':>8}  {'HASHRATE':>10}  {'TEMP':>4}  {'FAN':>4}  {'POWER':>5}  {'M':>2}  UPTIME")
         print("-" * 80)
 
-        results = {}
-        with ThreadPoolExecutor(max_workers=args.parallel) as executor:
-            futures = {executor.submit(get_fleet_status, host): host for host in hosts}
-            for future in as_completed(futures):
-                host = futures[future]
-                try:
-                    results[host] = future.result()
-                except Exception as e:
-                    results[host] = f"{host:<16} ERROR: {e}"
+        # One version+stats request per host, swept from a single thread with
+        # non-blocking sockets. Each reply goes to the pool as it arrives (only
+        # fallback stats for Avalon Q need more requests there), and rows print
+        # in host order, each as soon as it and the rows above it are done.
+        rows = [Future() for _ in hosts]
+        indexes: Dict[str, List[int]] = {}
+        for i, host in enumerate(hosts):
+            indexes.setdefault(host, []).append(i)
+        reported = set()
+
+        def settle(host, result=None, error=None):
+            for i in indexes[host]:
+                if error is None:
+                    rows[i].set_result(result)
+                else:
+                    rows[i].set_exception(error)
+
+        def fill_rows(host, reply):
+            try:
+                row = get_fleet_status(host, reply)
+            except Exception as e:
+                settle(host, error=e)
+            else:
+                settle(host, row)
+
+        def on_reply(host, reply):
+            reported.add(host)
+            executor.submit(fill_rows, host, reply)
+
+        def sweep():
+            try:
+                Miner.fleet_cmd(hosts, args.port, "+".join(FLEET_STATUS_COMMANDS),
+                                timeout=args.timeout, limit=args.parallel, on_reply=on_reply)
+            except Exception as e:
+                for host in indexes.keys() - reported:
+                    settle(host, error=e)
 
-        # Print in original order
-        for host in hosts:
-            print(results.get(host, f"{host:<16} UNKNOWN"))
+        with ThreadPoolExecutor(max_workers=args.parallel) as executor:
+            threading.Thread(target=sweep, name="sweep", daemon=True).start()
+            _print_in_order({row: i for i, row in enumerate(rows)}, lambda i, e: f"{hosts[i]:<16} ERROR: {e}")
         print()
     else:
-        # Other commands - parallel fetch, ordered output
-        results = {}
-        with ThreadPoolExecutor(max_workers=args.parallel) as executor:
-            futures = {executor.submit(run_command_on_host, host): host for host in hosts}
-            for future in as_completed(futures):
-                host = futures[future]
-                try:
-                    results[host] = future.result()
-                except Exception as e:
-                    results[host] = f"[{host}]\nerror: {e}\n"
-
-        # Print in original order
-        for host in hosts:
-            print(results.get(host, f"[{host}]\nUNKNOWN\n"))
+        # Other commands - parallel fetch, ordered output. Each worker's
+        # prints land in its own buffers through the per-thread streams,
+        # and finished blocks go straight to the real stdout in host order.
+        real_stdout = sys.stdout
+        with redirect_stdout(stdout), redirect_stderr(stderr), \
+                ThreadPoolExecutor(max_workers=args.parallel) as executor:
+            futures = {executor.submit(run_command_on_host, host): i for i, host in enumerate(hosts)}
+            _print_in_order(futures, lambda i, e: f"[{hosts[i]}]\nerror: {e}\n", file=real_stdout)
 
 
 if __name__ == "__main__":